@@ -0,0 +1,198 @@
+import os
+import json
+import time
+import threading
+from datetime import date
+from pathlib import Path
+from typing import List, Dict, Optional
+import requests
+import pandas as pd
+from packaging.version import Version, InvalidVersion
+from usage_index import APP_DIR
+
+# Release/EOL data for every CPython cycle in one request. Point
+# PYENV_MANAGER_RELEASE_SOURCE at a local JSON file to use a stub instead.
+RELEASE_SOURCE = os.environ.get("PYENV_MANAGER_RELEASE_SOURCE", "https://endoflife.date/api/python.json")
+CACHE_FILE = APP_DIR / "release_cache.json"
+CACHE_TTL = 6 * 3600
+# Wait this long after a failed fetch before trying again
+RETRY_BACKOFF = 300
+REQUEST_TIMEOUT = 10
+
+class ReleaseDataClient:
+    """Cached client for Python release cycle data.
+
+    Data is kept in memory and on disk; stale data is served while a
+    background thread fetches a fresh copy, so callers never block on the
+    network unless they ask to.
+    """
+
+    def __init__(self, source: str = RELEASE_SOURCE, cache_file: Optional[Path] = CACHE_FILE,
+                 ttl: float = CACHE_TTL, backoff: float = RETRY_BACKOFF):
+        self.source = source
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.backoff = backoff
+        self._cycles = None
+        self._fetched_at = 0.0
+        self._failed_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+        self.last_error = None
+
+    def _fetch(self) -> List[Dict]:
+        """Fetch cycle data from the configured URL or local file."""
+        if self.source.startswith(("http://", "https://")):
+            response = requests.get(self.source, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            return response.json()
+        path = self.source[len("file://"):] if self.source.startswith("file://") else self.source
+        with open(path) as f:
+            return json.load(f)
+
+    def _load_cache(self):
+        """Load the on-disk cache into memory, if present."""
+        if not self.cache_file or self._cycles is not None:
+            return
+        try:
+            with open(self.cache_file) as f:
+                cached = json.load(f)
+            if cached.get("source") == self.source:
+                self._cycles = cached["cycles"]
+                self._fetched_at = cached["fetched_at"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def is_stale(self) -> bool:
+        """Whether the cached data is missing or older than the TTL."""
+        return self._cycles is None or time.time() - self._fetched_at > self.ttl
+
+    def is_backing_off(self) -> bool:
+        """Whether the last fetch failed too recently to try again."""
+        return time.time() - self._failed_at < self.backoff
+
+    def refresh(self) -> Optional[List[Dict]]:
+        """Fetch fresh data now and update both caches."""
+        try:
+            cycles = self._fetch()
+        except Exception as e:
+            self.last_error = str(e)
+            self._failed_at = time.time()
+            return self._cycles
+        with self._lock:
+            self._cycles = cycles
+            self._fetched_at = time.time()
+            self.last_error = None
+        if self.cache_file:
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.cache_file, "w") as f:
+                    json.dump({"source": self.source, "fetched_at": self._fetched_at, "cycles": cycles}, f)
+            except OSError:
+                pass
+        return cycles
+
+    def refresh_in_background(self):
+        """Start a refresh thread unless one is already running."""
+        with self._lock:
+            if self._refresh_thread and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(target=self.refresh, daemon=True)
+            self._refresh_thread.start()
+
+    def is_refreshing(self) -> bool:
+        """Whether a background refresh is in flight."""
+        return bool(self._refresh_thread and self._refresh_thread.is_alive())
+
+    def get(self, block: bool = False) -> Optional[List[Dict]]:
+        """Get cycle data, refreshing it if stale.
+
+        Without block, stale or missing data triggers a background refresh
+        and whatever is cached (possibly None) is returned immediately.
+        After a failed fetch, no new fetch starts until the backoff passes.
+        """
+        self._load_cache()
+        if self.is_stale() and not self.is_backing_off():
+            if block:
+                return self.refresh()
+            self.refresh_in_background()
+        return self._cycles
+
+_client = None
+
+def get_release_client() -> ReleaseDataClient:
+    """Get the process-wide release data client."""
+    global _client
+    if _client is None:
+        _client = ReleaseDataClient()
+    return _client
+
+def _parse_release(name: str):
+    """Parse an interpreter name into (cycle, Version), or None."""
+    try:
+        parsed = Version(name)
+    except InvalidVersion:
+        return None  # pypy, miniconda, virtualenv names, ...
+    if len(parsed.release) < 2:
+        return None
+    return f"{parsed.release[0]}.{parsed.release[1]}", parsed
+
+def _to_dates(values: pd.Series) -> pd.Series:
+    """Parse endoflife.date fields, which are a date string or a bool, as dates."""
+    return pd.to_datetime(values.map(lambda v: pd.NaT if isinstance(v, bool) else v), errors="coerce")
+
+def _reached(values: pd.Series, today: pd.Timestamp) -> pd.Series:
+    """Whether each date-or-bool field has passed as of today."""
+    return values.map(lambda v: v is True) | (_to_dates(values) <= today)
+
+def compute_advice(installed: List[str], cycles: List[Dict]) -> pd.DataFrame:
+    """Compute upgrade and EOL advice for all installed interpreters at once."""
+    columns = ["Version", "Cycle", "Latest", "Upgrade", "Security Only", "EOL", "EOL Date"]
+    parsed = [(name, *p) for name in installed if (p := _parse_release(name))]
+    if not parsed or not cycles:
+        return pd.DataFrame(columns=columns)
+
+    versions = pd.DataFrame(parsed, columns=["Version", "Cycle", "Parsed"])
+    releases = pd.DataFrame(cycles).reindex(columns=["cycle", "latest", "eol", "support"])
+    releases["cycle"] = releases["cycle"].astype(str)
+    releases["LatestParsed"] = [
+        p[1] if (p := _parse_release(str(latest))) else None for latest in releases["latest"]
+    ]
+    advice = versions.merge(releases, left_on="Cycle", right_on="cycle", how="left")
+
+    today = pd.Timestamp(date.today())
+    # Full version ordering, so 3.14.0a3 is current when 3.14.0a3 is the latest
+    advice["Upgrade"] = [
+        isinstance(latest, Version) and installed < latest
+        for installed, latest in zip(advice["Parsed"], advice["LatestParsed"])
+    ]
+    advice["EOL"] = _reached(advice["eol"], today)
+    advice["Security Only"] = _reached(advice["support"], today) & ~advice["EOL"]
+    advice["EOL Date"] = _to_dates(advice["eol"]).dt.date
+    advice["Latest"] = advice["latest"]
+    return advice[columns]
+
+def newest_release(cycles: List[Dict]) -> Optional[str]:
+    """Latest stable release of the newest cycle."""
+    releases = []
+    for cycle in cycles:
+        try:
+            releases.append(Version(str(cycle.get("latest"))))
+        except InvalidVersion:
+            continue
+    stable = [r for r in releases if not r.is_prerelease]
+    return str(max(stable)) if stable else None
+
+def format_advice(advice: pd.DataFrame, newest: Optional[str] = None) -> List[str]:
+    """Render advice rows as the suggestion strings shown in the UI."""
+    suggestions = []
+    for row in advice.to_dict("records"):
+        if row["Upgrade"]:
+            suggestions.append(f"ℹ️ Upgrade recommended: {row['Version']} → {row['Latest']}")
+        if row["EOL"]:
+            when = f" on {row['EOL Date']}" if pd.notna(row["EOL Date"]) else ""
+            target = f", move to {newest}" if newest else ""
+            suggestions.append(f"⚠️ Python {row['Cycle']} reached end of life{when}{target}")
+        elif row["Security Only"]:
+            suggestions.append(f"⚠️ Python {row['Cycle']} only receives security fixes until {row['EOL Date']}")
+    return suggestions
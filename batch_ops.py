@@ -0,0 +1,131 @@
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
+from usage_index import get_versions_dir, list_interpreters
+
+# Batch install/uninstall/set operations on pyenv versions
+MAX_BATCH_WORKERS = 4
+OPERATIONS = ("install", "uninstall", "global", "local")
+
+def plan_batch(actions: List[Dict], installed: Optional[List[str]] = None) -> List[Dict]:
+    """Plan a list of {"op", "version"} actions against one listing of installs.
+
+    Each planned action gets a status of "pending", or "skipped"/"invalid"
+    with a detail explaining why it will not run.
+    """
+    if installed is None:
+        installed = list_interpreters(get_versions_dir())
+    installed = set(installed)
+    to_install = {a["version"] for a in actions if a["op"] == "install"}
+    to_uninstall = {a["version"] for a in actions if a["op"] == "uninstall"}
+
+    planned, seen = [], set()
+    for action in actions:
+        op, version = action["op"], action["version"]
+        step = {"op": op, "version": version, "status": "pending", "detail": ""}
+        if op not in OPERATIONS:
+            step.update(status="invalid", detail=f"Unknown operation: {op}")
+        elif (op, version) in seen:
+            step.update(status="skipped", detail="Duplicate action")
+        elif op == "install" and version in installed:
+            step.update(status="skipped", detail="Version already installed")
+        elif op == "install" and version in to_uninstall:
+            step.update(status="invalid", detail="Version is also being uninstalled")
+        elif op == "uninstall" and version not in installed:
+            step.update(status="skipped", detail="Version not installed")
+        elif op in ("global", "local") and version in to_uninstall:
+            step.update(status="invalid", detail="Version is being uninstalled")
+        elif op in ("global", "local") and version not in installed | to_install:
+            step.update(status="invalid", detail="Version not installed")
+        seen.add((op, version))
+        planned.append(step)
+    return planned
+
+def _run(command: List[str], cwd: Optional[Path] = None):
+    """Run a pyenv command, returning (ok, detail)."""
+    result = subprocess.run(command, capture_output=True, text=True, cwd=cwd)
+    output = (result.stderr or result.stdout).strip()
+    return result.returncode == 0, output.splitlines()[0] if output else ""
+
+def run_batch(actions: List[Dict], max_workers: int = MAX_BATCH_WORKERS,
+              cwd: Optional[Path] = None, dry_run: bool = False,
+              installed: Optional[List[str]] = None) -> List[Dict]:
+    """Plan and run a batch of version operations.
+
+    Installs run concurrently, then uninstalls, then all global and all
+    local versions are each set with a single pyenv command (the first
+    version listed takes precedence, as with ``pyenv global A B``).
+    ``installed`` is passed on to plan_batch.
+    """
+    planned = plan_batch(actions, installed)
+    if dry_run:
+        return planned
+    pending = [step for step in planned if step["status"] == "pending"]
+
+    def apply(step):
+        ok, detail = _run(
+            ["pyenv", "install", "-s", step["version"]] if step["op"] == "install"
+            else ["pyenv", "uninstall", "-f", step["version"]]
+        )
+        step.update(status="done" if ok else "failed", detail=detail)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for op in ("install", "uninstall"):
+            list(executor.map(apply, [s for s in pending if s["op"] == op]))
+
+    failed_installs = {s["version"] for s in pending if s["op"] == "install" and s["status"] == "failed"}
+    for scope in ("global", "local"):
+        steps = [s for s in pending if s["op"] == scope]
+        for step in steps:
+            if step["version"] in failed_installs:
+                step.update(status="skipped", detail="Install failed")
+        steps = [s for s in steps if s["status"] == "pending"]
+        if steps:
+            ok, detail = _run(["pyenv", scope] + [s["version"] for s in steps], cwd=cwd)
+            for step in steps:
+                step.update(status="done" if ok else "failed", detail=detail)
+    return planned
+
+def parse_args(argv=None):
+    """Parse command line arguments for headless batch runs."""
+    parser = argparse.ArgumentParser(description="Install, uninstall and set many pyenv versions at once.")
+    parser.add_argument("--install", nargs="+", default=[], metavar="VERSION")
+    parser.add_argument("--uninstall", nargs="+", default=[], metavar="VERSION")
+    parser.add_argument("--global", dest="global_", nargs="+", default=[], metavar="VERSION")
+    parser.add_argument("--local", nargs="+", default=[], metavar="VERSION")
+    parser.add_argument("--jobs", type=int, default=MAX_BATCH_WORKERS, help="Concurrent installs/uninstalls")
+    parser.add_argument("--dry-run", action="store_true", help="Only print the plan")
+    parser.add_argument("--force", action="store_true", help="Uninstall even if projects pin a version")
+    parser.add_argument(
+        "--projects-dir", type=Path,
+        help="Directory of projects checked for pinned versions (default: $PYENV_MANAGER_PROJECTS_DIR)"
+    )
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    """Run a batch from the command line, printing one JSON result per action."""
+    args = parse_args(argv)
+    actions = (
+        [{"op": "install", "version": v} for v in args.install]
+        + [{"op": "uninstall", "version": v} for v in args.uninstall]
+        + [{"op": "global", "version": v} for v in args.global_]
+        + [{"op": "local", "version": v} for v in args.local]
+    )
+    if args.uninstall and not args.force:
+        # Same pin check as the UI and `python -m pyenv_cli uninstall`
+        from pyenv_core import get_pinned_versions
+        pinned = get_pinned_versions(args.uninstall, args.projects_dir)
+        if pinned:
+            print(json.dumps({"error": "Versions are still pinned; use --force to uninstall anyway", "pinned": pinned}))
+            return 1
+    results = run_batch(actions, max_workers=args.jobs, cwd=Path.cwd(), dry_run=args.dry_run)
+    for result in results:
+        print(json.dumps(result))
+    return 1 if any(r["status"] in ("failed", "invalid") for r in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import statistics
+import subprocess
+import tracemalloc
+from pathlib import Path
+import pytest
+
+# Benchmark settings, all overridable from the environment:
+#   BENCH_BASELINE         baseline file (default benchmarks/baseline.json)
+#   BENCH_UPDATE_BASELINE  set to 1 to rewrite the baseline from this run
+#   BENCH_THRESHOLD        allowed slowdown/memory growth, 0.5 = +50%
+#   BENCH_MIN_DELTA_MS     slowdowns below this are treated as noise
+#   BENCH_REPEAT           timed runs per benchmark (median is recorded)
+#   BENCH_VERSIONS, BENCH_ENVS, FAKE_PYENV_LATENCY  size of the fake pyenv
+BENCH_DIR = Path(__file__).parent
+REPO_DIR = BENCH_DIR.parent
+BASELINE_FILE = Path(os.environ.get("BENCH_BASELINE", BENCH_DIR / "baseline.json"))
+UPDATE_BASELINE = os.environ.get("BENCH_UPDATE_BASELINE") == "1"
+THRESHOLD = float(os.environ.get("BENCH_THRESHOLD", "0.5"))
+MIN_DELTA_MS = float(os.environ.get("BENCH_MIN_DELTA_MS", "20"))
+REPEAT = int(os.environ.get("BENCH_REPEAT", "5"))
+N_VERSIONS = int(os.environ.get("BENCH_VERSIONS", "300"))
+N_ENVS = int(os.environ.get("BENCH_ENVS", "200"))
+
+sys.path.insert(0, str(BENCH_DIR))
+sys.path.insert(0, str(REPO_DIR))
+from fake_pyenv import build_fake_pyenv
+
+# The app's modules read HOME and PYENV_ROOT at import time, so the fake
+# environment has to exist before any test module imports them.
+WORK_DIR = Path(tempfile.mkdtemp(prefix="pyenv-bench-"))
+PYENV_ROOT = build_fake_pyenv(WORK_DIR, n_versions=N_VERSIONS, n_envs=N_ENVS)
+HOME_DIR = WORK_DIR / "home"
+HOME_DIR.mkdir()
+os.environ["HOME"] = str(HOME_DIR)
+os.environ["PYENV_ROOT"] = str(PYENV_ROOT)
+os.environ["PATH"] = f"{PYENV_ROOT / 'bin'}{os.pathsep}{os.environ['PATH']}"
+os.environ["PYENV_MANAGER_RELEASE_SOURCE"] = str(BENCH_DIR / "release_stub.json")
+os.environ.setdefault("FAKE_PYENV_LATENCY", "0.005")
+
+try:
+    with open(BASELINE_FILE) as f:
+        BASELINE = json.load(f)
+except (OSError, ValueError):
+    BASELINE = {}
+RESULTS = {}
+
+class CountingPopen(subprocess.Popen):
+    """Popen that counts every process started."""
+    count = 0
+
+    def __init__(self, *args, **kwargs):
+        CountingPopen.count += 1
+        super().__init__(*args, **kwargs)
+
+def compare_to_baseline(name: str, result: dict) -> list:
+    """List the ways a result regressed against its baseline entry."""
+    base = BASELINE.get(name)
+    if not base or UPDATE_BASELINE:
+        return []
+    problems = []
+    slowdown = result["median_ms"] - base["median_ms"]
+    if result["median_ms"] > base["median_ms"] * (1 + THRESHOLD) and slowdown > MIN_DELTA_MS:
+        problems.append(f"time {result['median_ms']:.1f} ms vs baseline {base['median_ms']:.1f} ms")
+    if result["subprocesses"] > base["subprocesses"]:
+        problems.append(f"{result['subprocesses']} subprocesses vs baseline {base['subprocesses']}")
+    if result["peak_kb"] > base["peak_kb"] * (1 + THRESHOLD):
+        problems.append(f"peak memory {result['peak_kb']:.0f} KB vs baseline {base['peak_kb']:.0f} KB")
+    return problems
+
+@pytest.fixture
+def bench(monkeypatch):
+    """Measure a callable: subprocess count and peak memory of one call,
+    then the median wall time over BENCH_REPEAT calls.
+    """
+    project_dir = WORK_DIR / "cwd"
+    project_dir.mkdir(exist_ok=True)
+    monkeypatch.chdir(project_dir)
+    monkeypatch.setattr(subprocess, "Popen", CountingPopen)
+
+    def run(name, func, *args, repeat=REPEAT, **kwargs):
+        CountingPopen.count = 0
+        tracemalloc.start()
+        value = func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        subprocesses = CountingPopen.count
+
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(*args, **kwargs)
+            samples.append((time.perf_counter() - start) * 1000)
+
+        result = {
+            "median_ms": round(statistics.median(samples), 3),
+            "subprocesses": subprocesses,
+            "peak_kb": round(peak / 1024, 1)
+        }
+        RESULTS[name] = result
+        problems = compare_to_baseline(name, result)
+        if problems:
+            pytest.fail(f"{name} regressed: " + "; ".join(problems))
+        return value
+
+    return run
+
+def pytest_sessionfinish(session, exitstatus):
+    """Write the baseline from a passing run when asked to, or when there is none yet."""
+    if RESULTS and exitstatus == 0 and (UPDATE_BASELINE or not BASELINE):
+        with open(BASELINE_FILE, "w") as f:
+            json.dump({**BASELINE, **RESULTS}, f, indent=2, sort_keys=True)
+    shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+def pytest_terminal_summary(terminalreporter):
+    """Print the measurements next to their baseline."""
+    if not RESULTS:
+        return
+    terminalreporter.section("benchmarks")
+    for name, result in sorted(RESULTS.items()):
+        base = BASELINE.get(name, {})
+        terminalreporter.write_line(
+            f"{name:<28} {result['median_ms']:>9.1f} ms"
+            f" (baseline {base.get('median_ms', float('nan')):>9.1f})"
+            f" {result['subprocesses']:>4} procs  {result['peak_kb']:>9.0f} KB peak"
+        )
@@ -0,0 +1,111 @@
+import os
+import sys
+import json
+import stat
+from pathlib import Path
+
+# Synthetic PYENV_ROOT plus a stub `pyenv` executable for benchmarks.
+# The stub sleeps FAKE_PYENV_LATENCY seconds per call to mimic pyenv's
+# shell startup and answers from the directory tree it is pointed at.
+
+STUB_PYENV = r'''#!{python}
+import os
+import sys
+import time
+import shutil
+from pathlib import Path
+
+time.sleep(float(os.environ.get("FAKE_PYENV_LATENCY", "0.005")))
+root = Path(os.environ["PYENV_ROOT"])
+versions = root / "versions"
+args = sys.argv[1:]
+command = args[0] if args else ""
+
+if command == "--version":
+    print("pyenv 2.4.0-fake")
+elif command == "versions":
+    names = []
+    for entry in sorted(os.listdir(versions)):
+        names.append(entry)
+        envs = versions / entry / "envs"
+        if envs.is_dir() and not (versions / entry).is_symlink():
+            names.extend(f"{{entry}}/envs/{{env}}" for env in sorted(os.listdir(envs)))
+    print("\n".join(names))
+elif command == "install" and args[1:2] == ["--list"]:
+    print("Available versions:")
+    for minor in range(0, 14):
+        for micro in range(0, 25):
+            print(f"  3.{{minor}}.{{micro}}")
+    for flavour in ("pypy3.10-7.3.17", "miniconda3-latest", "graalpy-24.1.0"):
+        print(f"  {{flavour}}")
+elif command == "install":
+    (versions / args[-1] / "bin").mkdir(parents=True, exist_ok=True)
+elif command == "uninstall":
+    shutil.rmtree(versions / args[-1], ignore_errors=True)
+elif command == "global":
+    version_file = root / "version"
+    if len(args) > 1:
+        version_file.write_text("\n".join(args[1:]) + "\n")
+    else:
+        print(version_file.read_text().strip() if version_file.exists() else "system")
+elif command == "local":
+    local_file = Path.cwd() / ".python-version"
+    if len(args) > 1:
+        local_file.write_text("\n".join(args[1:]) + "\n")
+    elif local_file.exists():
+        print(local_file.read_text().strip())
+    else:
+        print("pyenv: no local version configured for this directory", file=sys.stderr)
+        sys.exit(1)
+elif command == "prefix":
+    print(versions / args[1])
+elif command == "virtualenv":
+    base, name = args[-2], args[-1]
+    env_dir = versions / base / "envs" / name
+    (env_dir / "bin").mkdir(parents=True, exist_ok=True)
+    alias = versions / name
+    if not alias.exists():
+        alias.symlink_to(env_dir)
+'''
+
+STUB_PYTHON = '''#!/bin/sh
+cat "$(dirname "$0")/../packages.json"
+'''
+
+def _write_executable(path: Path, content: str):
+    """Write a script and mark it executable."""
+    path.write_text(content)
+    path.chmod(path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+def build_fake_pyenv(base_dir: Path, n_versions: int = 300, n_envs: int = 200,
+                     n_packages: int = 50) -> Path:
+    """Create a synthetic pyenv root and stub executable under base_dir.
+
+    Returns the PYENV_ROOT; the stub lives in PYENV_ROOT/bin. Every
+    interpreter and env gets a stub bin/python that answers
+    ``python -m pip list --format=json`` with n_packages entries.
+    """
+    root = base_dir / "pyenv"
+    versions_dir = root / "versions"
+    (root / "bin").mkdir(parents=True, exist_ok=True)
+    _write_executable(root / "bin" / "pyenv", STUB_PYENV.format(python=sys.executable))
+
+    packages = json.dumps([{"name": f"package-{i}", "version": f"1.{i}.0"} for i in range(n_packages)])
+
+    def make_interpreter(path: Path):
+        (path / "bin").mkdir(parents=True, exist_ok=True)
+        (path / "lib").mkdir(exist_ok=True)
+        (path / "packages.json").write_text(packages)
+        _write_executable(path / "bin" / "python", STUB_PYTHON)
+
+    versions = [f"3.{6 + i % 8}.{i // 8}" for i in range(n_versions)]
+    for version in versions:
+        make_interpreter(versions_dir / version)
+    for i in range(n_envs):
+        base = versions[i % len(versions)]
+        env_dir = versions_dir / base / "envs" / f"env-{i}"
+        make_interpreter(env_dir)
+        os.symlink(env_dir, versions_dir / f"env-{i}")
+
+    (root / "version").write_text(f"{versions[0]}\n")
+    return root
@@ -0,0 +1,49 @@
+import itertools
+from conftest import WORK_DIR, N_VERSIONS, N_ENVS, REPO_DIR
+import pyenv_core as core
+
+def test_list_installed_versions(bench):
+    versions = bench("list_installed_versions", core.list_installed_versions)
+    assert len(versions) >= N_VERSIONS
+
+def test_get_available_versions(bench):
+    versions = bench("get_available_versions", core.get_available_versions)
+    assert versions and all(v.startswith("3.1") for v in versions)
+
+def test_get_virtualenvs(bench):
+    venvs = bench("get_virtualenvs", core.get_virtualenvs)
+    assert len(venvs) == N_VERSIONS + N_ENVS
+
+def test_manage_pip_packages(bench):
+    packages = bench("manage_pip_packages", core.manage_pip_packages, "env-0")
+    assert packages and packages[0]["name"] == "package-0"
+
+def test_backup_restore(bench):
+    backup_path = WORK_DIR / "backup"
+
+    def round_trip():
+        assert core.backup_pyenv_config(str(backup_path))
+        assert core.restore_pyenv_config(f"{backup_path}.zip")
+
+    bench("backup_restore_pyenv_config", round_trip, repeat=2)
+
+def test_save_project_info(bench):
+    counter = itertools.count()
+
+    def save():
+        core.save_project_info(WORK_DIR / f"project-{next(counter)}", "web", ["3.12.1"])
+
+    bench("save_project_info", save)
+    assert core.get_recent_projects()[0]["type"] == "web"
+
+def test_main_render(bench):
+    from streamlit.testing.v1 import AppTest
+
+    def render():
+        app = AppTest.from_file(str(REPO_DIR / "pyenv.py"), default_timeout=120)
+        app.run()
+        assert not app.exception
+        return app
+
+    app = bench("main_render", render, repeat=3)
+    assert len(app.tabs) == 6
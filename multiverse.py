@@ -2,43 +2,79 @@ import os
 import sys
 from pathlib import Path
 import json
+import shutil
 import subprocess
+import statistics
+import time
 import toml
-from typing import List, Dict
-import virtualenv
-import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
+import logging
+from packaging.version import Version, InvalidVersion
+from usage_index import get_versions_dir, version_key
+
+logger = logging.getLogger("pyenv_manager")
+
+MAX_RECONCILE_WORKERS = 4
+PATHS_MODULE = "src/_multiverse_paths.py"
 
 class MultiverseProject:
-    def __init__(self, project_name: str, python_versions: List[str]):
+    def __init__(self, project_name: str, python_versions: List[str], root_dir: Optional[Path] = None):
         self.project_name = project_name
         self.python_versions = python_versions
-        self.root_dir = Path(project_name)
+        self.root_dir = Path(root_dir) if root_dir else Path(project_name)
         self.config_file = self.root_dir / "multiverse.toml"
+        self.env_paths = {version: f"envs/py{version.replace('.', '')}" for version in python_versions}
+
+    @classmethod
+    def from_config(cls, root_dir: Path) -> "MultiverseProject":
+        """Load a project from the multiverse.toml in root_dir."""
+        root_dir = Path(root_dir)
+        config = toml.load(root_dir / "multiverse.toml")
+        project = cls(
+            config["project"]["name"],
+            [str(v) for v in config["project"].get("python_versions", [])],
+            root_dir
+        )
+        for version, env in config.get("environments", {}).items():
+            if version in project.env_paths and "path" in env:
+                project.env_paths[version] = env["path"]
+        return project
+
+    def env_name(self, version: str) -> str:
+        """Name of the pyenv virtualenv backing a Python version."""
+        return f"{self.project_name}-{version}"
+
+    def _seed_files(self) -> Dict[str, str]:
+        """Files created with default content when missing."""
+        files = {
+            "src/main.py": self._generate_main_py(),
+            "requirements.txt": self._generate_base_requirements(),
+        }
+        for version in self.python_versions:
+            files[f"{self.env_paths[version]}/requirements.txt"] = f"# Python {version} dependencies\n"
+        return files
+
+    def _managed_files(self) -> Dict[str, str]:
+        """Files derived from multiverse.toml and rewritten when they drift."""
+        return {PATHS_MODULE: self._generate_paths_module()}
         
     def create_project_structure(self):
         """Create multiverse project structure."""
         # Create main project directories
-        (self.root_dir / "src").mkdir(parents=True, exist_ok=True)
-        (self.root_dir / "tests").mkdir(exist_ok=True)
-        (self.root_dir / "envs").mkdir(exist_ok=True)
-        (self.root_dir / "docs").mkdir(exist_ok=True)
-        
-        # Create main.py
-        with open(self.root_dir / "src" / "main.py", "w") as f:
-            f.write(self._generate_main_py())
-        
-        # Create version-specific directories
-        for version in self.python_versions:
-            version_dir = self.root_dir / "envs" / f"py{version.replace('.', '')}"
-            version_dir.mkdir(exist_ok=True)
-            
-            # Create version-specific requirements
-            with open(version_dir / "requirements.txt", "w") as f:
-                f.write(f"# Python {version} dependencies\n")
+        for directory in ("src", "tests", "envs", "docs"):
+            (self.root_dir / directory).mkdir(parents=True, exist_ok=True)
         
-        # Create unified requirements
-        with open(self.root_dir / "requirements.txt", "w") as f:
-            f.write(self._generate_base_requirements())
+        # Create main.py, requirements and version-specific directories
+        for rel_path, content in self._seed_files().items():
+            path = self.root_dir / rel_path
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(content)
+        for rel_path, content in self._managed_files().items():
+            path = self.root_dir / rel_path
+            if not path.exists() or path.read_text() != content:
+                path.write_text(content)
         
         # Create configuration file
         self._create_config()
@@ -50,16 +86,47 @@ class MultiverseProject:
         return '''
 import sys
 import os
-from pathlib import Path
+import importlib.machinery
+
+try:
+    from _multiverse_paths import VERSION_PATHS
+except ImportError:
+    VERSION_PATHS = {}
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 def get_python_version():
     return f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
 
+def get_version_path():
+    """Directory for this interpreter, falling back from major.minor.micro to major.minor."""
+    major_minor = f"{sys.version_info.major}.{sys.version_info.minor}"
+    rel_path = VERSION_PATHS.get(get_python_version()) or VERSION_PATHS.get(major_minor)
+    return os.path.join(PROJECT_ROOT, rel_path) if rel_path else None
+
+class VersionSpecificFinder:
+    """Resolve only the top-level modules shipped in the version directory."""
+
+    def __init__(self, path):
+        self.path = [path]
+        self.names = set()
+        for entry in os.scandir(path):
+            name = entry.name.split(".", 1)[0]
+            if entry.is_dir() and name.isidentifier():
+                self.names.add(name)
+            elif entry.name.endswith(tuple(importlib.machinery.all_suffixes())):
+                self.names.add(name)
+
+    def find_spec(self, fullname, path=None, target=None):
+        # Submodules resolve through their package's __path__
+        if path is not None or fullname not in self.names:
+            return None
+        return importlib.machinery.PathFinder.find_spec(fullname, self.path)
+
 def load_version_specific_modules():
-    version = get_python_version()
-    version_path = Path(__file__).parent.parent / "envs" / f"py{version.replace('.', '')}"
-    if version_path.exists():
-        sys.path.insert(0, str(version_path))
+    version_path = get_version_path()
+    if version_path and os.path.isdir(version_path):
+        sys.meta_path.insert(0, VersionSpecificFinder(version_path))
 
 def main():
     print(f"Running with Python {get_python_version()}")
@@ -70,6 +137,20 @@ if __name__ == "__main__":
     main()
 '''
 
+    def _generate_paths_module(self) -> str:
+        """Generate the version -> directory lookup used by main.py."""
+        paths = {}
+        for version in sorted(self.python_versions, key=version_key):
+            paths[version] = self.env_paths[version]
+            # The newest listed micro release serves unlisted patch releases
+            major_minor = ".".join(version.split(".")[:2])
+            paths[major_minor] = self.env_paths[version]
+        lines = [f"    {json.dumps(k)}: {json.dumps(v)}," for k, v in paths.items()]
+        return (
+            "# Generated from multiverse.toml by Pyenv Manager; do not edit.\n"
+            "VERSION_PATHS = {\n" + "\n".join(lines) + "\n}\n"
+        )
+
     def _generate_base_requirements(self) -> str:
         """Generate base requirements.txt."""
         return '''
@@ -89,23 +170,162 @@ mypy>=1.0.0
             },
             "environments": {
                 version: {
-                    "path": f"envs/py{version.replace('.', '')}",
-                    "requirements": f"envs/py{version.replace('.', '')}/requirements.txt"
+                    "path": self.env_paths[version],
+                    "requirements": f"{self.env_paths[version]}/requirements.txt"
                 } for version in self.python_versions
             }
         }
         
-        with open(self.config_file, "w") as f:
-            toml.dump(config, f)
+        content = toml.dumps(config)
+        if not self.config_file.exists() or self.config_file.read_text() != content:
+            self.config_file.write_text(content)
+
+    def plan(self) -> List[Dict]:
+        """Compare multiverse.toml with what is on disk.
+
+        Returns one entry per difference with its kind (interpreter, env,
+        pin, file or env_dir), state (missing, stale or extra) and target.
+        Only stats and small file reads are used, never subprocesses.
+        """
+        versions_dir = get_versions_dir()
+        actions = []
+        for version in self.python_versions:
+            if not (versions_dir / version).is_dir():
+                actions.append({"kind": "interpreter", "state": "missing", "target": version})
+
+            alias = versions_dir / self.env_name(version)
+            if not alias.is_symlink() and not alias.exists():
+                actions.append({"kind": "env", "state": "missing", "target": version})
+            elif not alias.exists():
+                # Dangling alias left behind by an uninstalled interpreter
+                actions.append({"kind": "env", "state": "stale", "target": version})
+
+            pin_file = self.root_dir / self.env_paths[version] / ".python-version"
+            if not pin_file.exists():
+                actions.append({"kind": "pin", "state": "missing", "target": version})
+            elif pin_file.read_text().strip() != self.env_name(version):
+                actions.append({"kind": "pin", "state": "stale", "target": version})
+
+        for rel_path in self._seed_files():
+            if not (self.root_dir / rel_path).exists():
+                actions.append({"kind": "file", "state": "missing", "target": rel_path})
+        for rel_path, content in self._managed_files().items():
+            path = self.root_dir / rel_path
+            if not path.exists():
+                actions.append({"kind": "file", "state": "missing", "target": rel_path})
+            elif path.read_text() != content:
+                actions.append({"kind": "file", "state": "stale", "target": rel_path})
+
+        configured = {Path(p).name for p in self.env_paths.values()}
+        envs_dir = self.root_dir / "envs"
+        if envs_dir.is_dir():
+            for entry in os.scandir(envs_dir):
+                if entry.is_dir() and entry.name not in configured:
+                    actions.append({"kind": "env_dir", "state": "extra", "target": f"envs/{entry.name}"})
+
+        expected = {self.env_name(v) for v in self.python_versions}
+        if versions_dir.is_dir():
+            for entry in os.scandir(versions_dir):
+                if entry.name not in expected and self._owns_env(versions_dir, entry.name):
+                    actions.append({
+                        "kind": "env",
+                        "state": "extra",
+                        "target": entry.name[len(self.project_name) + 1:]
+                    })
+        return actions
+
+    def _owns_env(self, versions_dir: Path, name: str) -> bool:
+        """Whether an env alias has exactly the shape env_name() gives it.
+
+        A bare prefix match would also catch other projects' envs (e.g.
+        ``rajiv-api-3.12.7`` for project ``rajiv``), so the suffix must be a
+        version and the alias must point at an env built on that version.
+        """
+        prefix = f"{self.project_name}-"
+        if not name.startswith(prefix):
+            return False
+        version = name[len(prefix):]
+        try:
+            Version(version)
+        except InvalidVersion:
+            return False
+        alias = versions_dir / name
+        if not alias.is_symlink():
+            return False
+        target = Path(os.path.realpath(alias))
+        return target.parent.name == "envs" and target.parent.parent.name == version
+
+    def _reconcile_version(self, version: str, actions: List[Dict]) -> List[Dict]:
+        """Apply the interpreter, env and pin actions for one version in order."""
+        results = []
+        for action in actions:
+            if action["kind"] == "interpreter":
+                result = subprocess.run(["pyenv", "install", "-s", version], capture_output=True, text=True)
+                ok = result.returncode == 0
+            elif action["kind"] == "env":
+                cmd = ["pyenv", "virtualenv", version, self.env_name(version)]
+                if action["state"] == "stale":
+                    cmd.insert(2, "--force")
+                result = subprocess.run(cmd, capture_output=True, text=True)
+                ok = result.returncode == 0
+            else:
+                # Same file `pyenv local` writes, without spawning a process
+                env_path = self.root_dir / self.env_paths[version]
+                env_path.mkdir(parents=True, exist_ok=True)
+                (env_path / ".python-version").write_text(f"{self.env_name(version)}\n")
+                ok = True
+            results.append({**action, "ok": ok})
+            if not ok:
+                break
+        return results
+
+    def apply(self, actions: List[Dict], prune: bool = False,
+              max_workers: int = MAX_RECONCILE_WORKERS) -> List[Dict]:
+        """Apply a plan; versions are reconciled in parallel.
+
+        Extra envs and env directories are only removed when prune is set.
+        """
+        results = []
+        by_version = {}
+        for action in actions:
+            if action["state"] == "extra":
+                if not prune:
+                    continue
+                if action["kind"] == "env":
+                    result = subprocess.run(
+                        ["pyenv", "uninstall", "-f", self.env_name(action["target"])],
+                        capture_output=True,
+                        text=True
+                    )
+                    results.append({**action, "ok": result.returncode == 0})
+                else:
+                    shutil.rmtree(self.root_dir / action["target"], ignore_errors=True)
+                    results.append({**action, "ok": True})
+            elif action["kind"] == "file":
+                path = self.root_dir / action["target"]
+                path.parent.mkdir(parents=True, exist_ok=True)
+                files = {**self._seed_files(), **self._managed_files()}
+                path.write_text(files[action["target"]])
+                results.append({**action, "ok": True})
+            else:
+                by_version.setdefault(action["target"], []).append(action)
+
+        if by_version:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for version_results in executor.map(
+                    lambda item: self._reconcile_version(*item), by_version.items()
+                ):
+                    results.extend(version_results)
+        return results
+
+    def reconcile(self, prune: bool = False) -> List[Dict]:
+        """Bring the on-disk project in line with its configuration."""
+        return self.apply(self.plan(), prune=prune)
 
     def setup_environments(self):
         """Setup virtual environments for all Python versions."""
-        for version in self.python_versions:
-            env_path = self.root_dir / "envs" / f"py{version.replace('.', '')}"
-            if not (env_path / "bin").exists():
-                subprocess.run(["pyenv", "install", "-s", version])
-                subprocess.run(["pyenv", "virtualenv", version, f"{self.project_name}-{version}"])
-                subprocess.run(["pyenv", "local", f"{self.project_name}-{version}"], cwd=str(env_path))
+        actions = [a for a in self.plan() if a["kind"] in ("interpreter", "env", "pin")]
+        return self.apply(actions)
 
 def create_multiverse_project(project_name: str, python_versions: List[str]) -> bool:
     """Create a new multiverse project."""
@@ -115,5 +335,39 @@ def create_multiverse_project(project_name: str, python_versions: List[str]) ->
         project.setup_environments()
         return True
     except Exception as e:
-        st.error(f"Failed to create multiverse project: {str(e)}")
+        logger.error(f"Failed to create multiverse project: {str(e)}")
         return False
+
+def reconcile_multiverse_project(root_dir: Path, prune: bool = False, dry_run: bool = False) -> List[Dict]:
+    """Plan, and unless dry_run apply, the changes a multiverse project needs."""
+    project = MultiverseProject.from_config(root_dir)
+    actions = project.plan()
+    if dry_run:
+        return actions
+    return project.apply(actions, prune=prune)
+
+def benchmark_entry_point(root_dir: Path, python: str = sys.executable, runs: int = 10) -> Dict:
+    """Time cold starts of a project's generated src/main.py.
+
+    A bare ``python -c pass`` is timed alongside it so the overhead the
+    entry point adds on top of interpreter startup can be read directly.
+    """
+    main_py = str(Path(root_dir) / "src" / "main.py")
+
+    def timed(cmd):
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(cmd, capture_output=True, check=True)
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
+
+    baseline_ms = timed([python, "-c", "pass"])
+    entry_ms = timed([python, main_py])
+    return {
+        "python": python,
+        "runs": runs,
+        "baseline_ms": round(baseline_ms, 2),
+        "entry_point_ms": round(entry_ms, 2),
+        "overhead_ms": round(entry_ms - baseline_ms, 2)
+    }
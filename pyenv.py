@@ -1,370 +1,44 @@
-import subprocess
-import os
-import sys
+import logging
 from datetime import datetime
 import streamlit as st
-import re
 import pandas as pd
-import requests
-from packaging import version
-import yaml
-import psutil
-import shutil
-import json
 from pathlib import Path
 from typing import List, Dict
-from multiverse import create_multiverse_project  # Add this import
+from pyenv_core import (
+    logger, check_pyenv_installed, list_installed_versions, install_version, uninstall_version,
+    get_available_versions, set_python_version, update_pyenv, create_virtualenv, get_virtualenvs,
+    backup_pyenv_config, restore_pyenv_config, get_environment_health, create_project_structure,
+    analyze_dependencies, generate_project_template, suggest_version_upgrade, get_release_data_loading,
+    get_recent_projects, save_project_info, get_version_usage, get_projects_dir, open_in_editor,
+    create_desktop_shortcut
+)
+from multiverse import create_multiverse_project, reconcile_multiverse_project, benchmark_entry_point  # Add this import
+from usage_index import get_version_users, find_orphaned_versions, get_versions_dir, list_interpreters
+from batch_ops import run_batch
+from scaffold import parse_manifest, scaffold_projects
 
 # Configuration and Setup
 DEBUG = True
 
-def debug_log(message):
-    """Log debug messages with timestamp."""
-    if DEBUG:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        st.text(f"[DEBUG] {timestamp}: {message}")
-
-def run_command(command, check=True):
-    """Execute shell commands and handle errors."""
-    try:
-        result = subprocess.run(
-            command,
-            check=check,
-            shell=True,
-            capture_output=True,
-            text=True
-        )
-        debug_log(f"Command executed: {command}")
-        return result
-    except subprocess.CalledProcessError as e:
-        st.error(f"Command failed: {e}")
-        debug_log(f"Error: {e}")
-        return None
-
-# Core Pyenv Functions
-def check_pyenv_installed():
-    """Check if pyenv is installed and accessible."""
-    result = run_command("pyenv --version", check=False)
-    if result and result.returncode == 0:
-        return result.stdout.strip()
-    return None
-
-def list_installed_versions():
-    """Get list of installed Python versions."""
-    result = run_command("pyenv versions --bare", check=False)
-    if result and result.returncode == 0:
-        return [v.strip() for v in result.stdout.split('\n') if v.strip() and v[0].isdigit()]
-    return []
-
-def install_version(version):
-    """Install a specific Python version."""
-    if version in list_installed_versions():
-        return True, "Version already installed"
-    
-    result = run_command(f"pyenv install {version}")
-    success = result and result.returncode == 0
-    message = "Installation successful" if success else "Installation failed"
-    return success, message
-
-def uninstall_version(version):
-    """Uninstall a specific Python version."""
-    result = run_command(f"pyenv uninstall -f {version}", check=False)
-    return result and result.returncode == 0
-
-def get_available_versions():
-    """Get list of available Python versions."""
-    result = run_command("pyenv install --list", check=False)
-    if result and result.returncode == 0:
-        versions = []
-        for line in result.stdout.splitlines():
-            version = line.strip()
-            if version and re.match(r'^3\.(1[0-3])\.\d+$', version):
-                versions.append(version)
-        return sorted(versions, reverse=True)
-    return []
-
-def set_python_version(version, scope='global'):
-    """Set Python version as global or local."""
-    cmd = f"pyenv {scope} {version}"
-    result = run_command(cmd)
-    return result and result.returncode == 0
-
-def update_pyenv():
-    """Update pyenv to the latest version."""
-    result = run_command("pyenv update")
-    return result and result.returncode == 0
-
-def list_global_version():
-    """Get the global Python version."""
-    result = run_command("pyenv global", check=False)
-    if result and result.returncode == 0:
-        return result.stdout.strip()
-    return None
-
-def list_local_version():
-    """Get the local Python version."""
-    result = run_command("pyenv local", check=False)
-    if result and result.returncode == 0:
-        return result.stdout.strip()
-    return None
-
-# Virtual Environment Functions
-def create_virtualenv(version, env_name, local=True):
-    """Create a new virtual environment."""
-    try:
-        # Install virtualenv if needed
-        run_command("pip install virtualenv")
-        
-        # Create the virtualenv
-        cmd = f"pyenv virtualenv {version} {env_name}"
-        result = run_command(cmd)
-        
-        if result and result.returncode == 0:
-            if local:
-                run_command(f"pyenv local {env_name}")
-            return True
-        return False
-    except Exception as e:
-        debug_log(f"Error creating virtualenv: {str(e)}")
-        return False
-
-def get_virtualenvs():
-    """List all virtual environments."""
-    venv_path = os.path.expanduser("~/.pyenv/pyenv-win/versions" if os.name == 'nt' else "~/.pyenv/versions")
-    venvs = []
-    
-    if os.path.exists(venv_path):
-        for entry in os.listdir(venv_path):
-            full_path = os.path.join(venv_path, entry)
-            if os.path.isdir(full_path):
-                venvs.append({
-                    'Name': entry,
-                    'Path': full_path,
-                    'Active': False
-                })
-    return pd.DataFrame(venvs) if venvs else pd.DataFrame(columns=['Name', 'Path', 'Active'])
-
-def backup_pyenv_config(backup_path):
-    """Backup pyenv configurations and environments."""
-    pyenv_root = os.path.expanduser("~/.pyenv")
-    if os.path.exists(pyenv_root):
-        shutil.make_archive(backup_path, 'zip', pyenv_root)
-        return True
-    return False
-
-def restore_pyenv_config(backup_file):
-    """Restore pyenv configurations from backup."""
-    pyenv_root = os.path.expanduser("~/.pyenv")
-    if os.path.exists(backup_file):
-        shutil.unpack_archive(backup_file, pyenv_root)
-        return True
-    return False
-
-def get_environment_health():
-    """Check Python environment health."""
-    health_info = {
-        'disk_space': psutil.disk_usage('/').percent,
-        'memory_usage': psutil.virtual_memory().percent,
-        'cpu_usage': psutil.cpu_percent(),
-        'python_processes': len([p for p in psutil.process_iter(['name']) if 'python' in p.info['name'].lower()])
-    }
-    return health_info
-
-def manage_pip_packages(env_name):
-    """Manage pip packages for a specific environment."""
-    result = run_command(f"source $(pyenv prefix {env_name})/bin/activate && pip list --format=json", shell=True)
-    if result and result.returncode == 0:
-        return json.loads(result.stdout)
-    return []
-
-def get_default_project_path(project_name: str) -> Path:
-    """Get default project path on Desktop."""
-    desktop_path = Path.home() / "Desktop"
-    if not desktop_path.exists():
-        desktop_path = Path.home()  # Fallback to home directory
-    return desktop_path / project_name
-
-def create_project_structure(project_path: Path, python_version: str, packages=None):
-    """Create a new Python project structure."""
-    try:
-        # Create project directory and parents if they don't exist
-        project_path.mkdir(parents=True, exist_ok=True)
-        
-        # Create virtual environment
-        create_virtualenv(python_version, project_path.name, True)
-        
-        # Create project files
-        (project_path / 'src').mkdir(exist_ok=True)
-        (project_path / 'tests').mkdir(exist_ok=True)
-        (project_path / 'docs').mkdir(exist_ok=True)
-        
-        # Create requirements if packages specified
-        if packages:
-            with open(project_path / 'requirements.txt', 'w') as f:
-                f.write('\n'.join(packages))
-                
-        # Create .gitignore
-        with open(project_path / '.gitignore', 'w') as f:
-            f.write('''
-__pycache__/
-*.py[cod]
-*$py.class
-*.so
-.Python
-build/
-develop-eggs/
-dist/
-downloads/
-eggs/
-.eggs/
-lib/
-lib64/
-parts/
-sdist/
-var/
-wheels/
-*.egg-info/
-.installed.cfg
-*.egg
-.env
-venv/
-.venv/
-''')
-        
-        # Create README.md
-        with open(project_path / 'README.md', 'w') as f:
-            f.write(f'# {project_path.name}\n\nProject created with Pyenv Manager')
-        
-        return True
-    except Exception as e:
-        debug_log(f"Error creating project structure: {str(e)}")
-        return False
-
-def analyze_dependencies(requirements):
-    """AI-powered dependency analysis and recommendations."""
-    try:
-        packages = [line.strip() for line in requirements.split('\n') if line.strip()]
-        recommendations = {
-            'security': [],
-            'performance': [],
-            'compatibility': []
-        }
-        
-        for package in packages:
-            # Check known conflicts and security issues
-            response = requests.get(f"https://pypi.org/pypi/{package}/json")
-            if response.status_code == 200:
-                data = response.json()
-                if 'security' in data.get('info', {}).get('keywords', []):
-                    recommendations['security'].append(f"⚠️ {package} has security notes")
-                # Add version compatibility checks
-                python_version = data.get('info', {}).get('requires_python', '')
-                if python_version:
-                    recommendations['compatibility'].append(f"ℹ️ {package} requires Python {python_version}")
-        
-        return recommendations
-    except Exception as e:
-        debug_log(f"Dependency analysis error: {str(e)}")
-        return None
-
-def generate_project_template(project_type):
-    """AI-powered project template generation."""
-    templates = {
-        'web': {
-            'packages': ['flask', 'gunicorn', 'python-dotenv'],
-            'structure': [
-                'src/__init__.py',
-                'src/routes.py',
-                'src/models.py',
-                'templates/base.html',
-                'static/style.css',
-                '.env.example'
-            ]
-        },
-        'data-science': {
-            'packages': ['numpy', 'pandas', 'scikit-learn', 'jupyter'],
-            'structure': [
-                'notebooks/',
-                'data/raw/',
-                'data/processed/',
-                'src/data_processing.py',
-                'src/modeling.py'
-            ]
-        },
-        'cli': {
-            'packages': ['click', 'rich', 'typer'],
-            'structure': [
-                'src/cli.py',
-                'src/commands/',
-                'src/utils.py'
-            ]
-        }
-    }
-    return templates.get(project_type, {})
-
-def suggest_version_upgrade():
-    """AI-powered version upgrade suggestions."""
-    installed = list_installed_versions()
-    suggestions = []
-    
-    try:
-        # Get Python versions from PyPI
-        response = requests.get("https://pypi.org/pypi/python/json")
-        if response.status_code == 200:
-            pypi_data = response.json()
-            latest_version = max(v for v in get_available_versions())
-            
-            for version in installed:
-                if version < latest_version:
-                    suggestions.append(f"ℹ️ Upgrade recommended: {version} → {latest_version}")
-                    
-                    # Check for security advisories from PyPI
-                    try:
-                        security_response = requests.get(
-                            f"https://pypi.org/pypi/python/json",
-                            timeout=5
-                        )
-                        if security_response.status_code == 200:
-                            releases = security_response.json().get('releases', {})
-                            if version in releases and releases[version].get('security_advisory'):
-                                suggestions.append(f"⚠️ Version {version} has security updates available")
-                    except:
-                        debug_log(f"Failed to check security advisories for version {version}")
-        
-        return suggestions
-    except Exception as e:
-        debug_log(f"Error checking version upgrades: {str(e)}")
-        return []
-
-def get_recent_projects():
-    """Get list of recently created projects."""
-    projects_file = Path.home() / ".pyenv" / "projects.json"
-    if projects_file.exists():
-        with open(projects_file) as f:
-            return json.load(f)
-    return []
-
-def save_project_info(project_path: Path, project_type: str, python_versions: List[str]):
-    """Save project information for later access."""
-    projects_file = Path.home() / ".pyenv" / "projects.json"
-    projects = get_recent_projects()
-    project_info = {
-        "path": str(project_path.absolute()),
-        "type": project_type,
-        "python_versions": python_versions,
-        "created_at": datetime.now().isoformat()
-    }
-    projects.insert(0, project_info)
-    projects_file.parent.mkdir(exist_ok=True)
-    with open(projects_file, "w") as f:
-        json.dump(projects[:10], f)  # Keep only 10 most recent projects
-
-def open_in_editor(path: str):
-    """Open project in VS Code."""
-    if os.path.exists(path):
-        subprocess.run(["code", path])
-        return True
-    return False
+class StreamlitLogHandler(logging.Handler):
+    """Show core library log messages in the app."""
+
+    def emit(self, record):
+        message = record.getMessage()
+        if record.levelno >= logging.ERROR:
+            st.error(message)
+        elif DEBUG:
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            st.text(f"[DEBUG] {timestamp}: {message}")
+
+# Streamlit re-executes this script on every rerun, defining a new handler
+# class each time, so the previous handler is found by name and replaced
+for handler in [h for h in logger.handlers if h.get_name() == "streamlit"]:
+    logger.removeHandler(handler)
+log_handler = StreamlitLogHandler()
+log_handler.set_name("streamlit")
+logger.addHandler(log_handler)
+logger.setLevel(logging.DEBUG)
 
 def render_projects_sidebar():
     """Render projects sidebar with navigation."""
@@ -404,6 +78,8 @@ def render_version_management():
         with st.expander("🤖 Version Recommendations"):
             for suggestion in suggestions:
                 st.write(suggestion)
+    elif get_release_data_loading():
+        st.caption("Fetching Python release data in the background...")
     
     col1, col2 = st.columns(2)
     
@@ -427,6 +103,12 @@ def render_version_management():
     with col2:
         st.subheader("Installed Versions")
         installed = list_installed_versions()
+        projects_dir = st.text_input(
+            "Projects directory to check for pinned versions",
+            value=str(get_projects_dir() or ""),
+            key="usage_projects_dir"
+        )
+        index, usage = get_version_usage(Path(projects_dir) if projects_dir else None)
         if installed:
             version_to_manage = st.selectbox(
                 "Select version",
@@ -445,13 +127,31 @@ def render_version_management():
                         st.success(f"Set {version_to_manage} as local")
                         st.experimental_rerun()
             with col5:
-                if st.button("Uninstall"):
+                users = get_version_users(version_to_manage, usage)
+                force = True
+                if users:
+                    st.warning(f"{version_to_manage} is pinned by {len(users)} project file(s)")
+                    force = st.checkbox("Uninstall anyway", key="force_uninstall")
+                if st.button("Uninstall", disabled=not force):
                     if uninstall_version(version_to_manage):
                         st.success(f"Uninstalled {version_to_manage}")
                         st.experimental_rerun()
+            if users:
+                with st.expander(f"📌 Projects using {version_to_manage}"):
+                    for user in users:
+                        st.write(user)
         else:
             st.info("No Python versions installed")
 
+        orphans = find_orphaned_versions(index, usage)
+        if orphans:
+            with st.expander("♻️ Reclaimable Versions"):
+                orphans_df = pd.DataFrame(orphans)
+                st.dataframe(orphans_df, use_container_width=True)
+                st.write(f"Total reclaimable: {orphans_df['Size (MB)'].sum():.1f} MB")
+
+    render_batch_operations(available_versions, usage)
+
     st.subheader("Update Pyenv")
     if st.button("Update Pyenv"):
         if update_pyenv():
@@ -459,12 +159,48 @@ def render_version_management():
         else:
             st.error("Failed to update Pyenv")
 
+def render_batch_operations(available_versions: List[str], usage: Dict):
+    """Render batch install/uninstall/global controls."""
+    with st.expander("📦 Batch Operations"):
+        # The same interpreter listing is shown here and used to plan the batch
+        installed = list_interpreters(get_versions_dir())
+        to_install = st.multiselect("Install", available_versions or [], key="batch_install")
+        to_uninstall = st.multiselect("Uninstall", installed, key="batch_uninstall")
+        pinned = {v: users for v in to_uninstall if (users := get_version_users(v, usage))}
+        force = True
+        if pinned:
+            for version, users in pinned.items():
+                st.warning(f"{version} is pinned by {len(users)} project file(s)")
+            force = st.checkbox("Uninstall anyway", key="batch_force_uninstall")
+        global_versions = st.multiselect(
+            "Set Global (first takes precedence)",
+            sorted(set(installed) | set(to_install)),
+            key="batch_global"
+        )
+        actions = (
+            [{"op": "install", "version": v} for v in to_install]
+            + [{"op": "uninstall", "version": v} for v in to_uninstall]
+            + [{"op": "global", "version": v} for v in global_versions]
+        )
+        if actions:
+            st.dataframe(
+                pd.DataFrame(run_batch(actions, dry_run=True, installed=installed)),
+                use_container_width=True
+            )
+        if st.button("Run Batch", disabled=not actions or not force):
+            # Rerun once for the whole batch and show the results afterwards
+            st.session_state["batch_results"] = run_batch(actions, installed=installed)
+            st.rerun()
+        if "batch_results" in st.session_state:
+            st.write("**Last batch**")
+            st.dataframe(pd.DataFrame(st.session_state["batch_results"]), use_container_width=True)
+
 def render_virtualenv_management():
     """Render the virtual environment management section."""
     st.header("Virtual Environments")
     
     # Show existing environments
-    envs_df = get_virtualenvs()
+    envs_df = pd.DataFrame(get_virtualenvs(), columns=['Name', 'Path', 'Active'])
     if not envs_df.empty:
         st.dataframe(envs_df, use_container_width=True)
     
@@ -488,33 +224,6 @@ def render_virtualenv_management():
         else:
             st.warning("Please provide both version and environment name")
 
-def get_desktop_shortcut_content(project_path: Path) -> str:
-    """Generate desktop shortcut content."""
-    return f"""[Desktop Entry]
-Version=1.0
-Type=Application
-Name={project_path.name}
-Comment=Python Project created with Pyenv Manager
-Exec=code {project_path.absolute()}
-Icon=python
-Terminal=false
-Categories=Development;IDE;
-"""
-
-def create_desktop_shortcut(project_path: Path) -> bool:
-    """Create a desktop shortcut for the project."""
-    try:
-        desktop = Path.home() / "Desktop"
-        if desktop.exists():
-            shortcut_path = desktop / f"{project_path.name}.desktop"
-            with open(shortcut_path, "w") as f:
-                f.write(get_desktop_shortcut_content(project_path))
-            os.chmod(shortcut_path, 0o755)  # Make executable
-            return True
-    except Exception as e:
-        debug_log(f"Failed to create desktop shortcut: {e}")
-    return False
-
 def render_project_management():
     """Render project management section with AI features."""
     st.header("Project Management")
@@ -562,7 +271,7 @@ def render_project_management():
         if project_name and python_version:
             package_list = [p.strip() for p in packages.split('\n') if p.strip()]
             project_dir = Path(project_path)
-            if create_project_structure(project_dir, python_version, package_list):
+            if create_project_structure(project_dir, python_version, package_list, project_type):
                 save_project_info(project_dir, project_type, [python_version])
                 if create_shortcut:
                     if create_desktop_shortcut(project_dir):
@@ -575,6 +284,49 @@ def render_project_management():
             else:
                 st.error("Failed to create project")
 
+    render_batch_scaffolding()
+
+def render_batch_scaffolding():
+    """Render batch project scaffolding from a manifest file."""
+    with st.expander("📦 Batch Scaffolding"):
+        st.write("Create many projects at once from a TOML, YAML or JSON manifest:")
+        st.code("""
+[defaults]
+python_version = "3.12.1"
+type = "web"
+base_dir = "~/Desktop/services"
+
+[[projects]]
+name = "orders"
+
+[[projects]]
+name = "reports"
+type = "data-science"
+        """, language="toml")
+        manifest_file = st.file_uploader(
+            "Manifest",
+            type=["toml", "yaml", "yml", "json"],
+            key="scaffold_manifest"
+        )
+        env_workers = st.slider("Parallel environment builds", 1, 16, 4, key="scaffold_env_workers")
+        if manifest_file and st.button("Scaffold Projects"):
+            try:
+                fmt = manifest_file.name.rsplit(".", 1)[-1].lower()
+                specs = parse_manifest(manifest_file.getvalue().decode(), fmt)
+            except Exception as e:
+                st.error(f"Invalid manifest: {e}")
+                return
+            results = scaffold_projects(specs, env_workers=env_workers)
+            for spec, result in zip(specs, results):
+                if not result["Error"]:
+                    save_project_info(spec["path"], spec.get("type", ""), [spec.get("python_version", "")])
+            st.dataframe(pd.DataFrame(results), use_container_width=True)
+            failed = [r["Name"] for r in results if r["Error"] or r["Env"] == "failed"]
+            if failed:
+                st.warning(f"Problems scaffolding: {', '.join(failed)}")
+            else:
+                st.success(f"Scaffolded {len(results)} projects")
+
 def render_system_health():
     """Render system health information."""
     st.header("System Health")
@@ -651,6 +403,44 @@ project/
         else:
             st.warning("Please provide project name and select Python versions")
 
+    st.subheader("Reconcile Existing Project")
+    project_dir = st.text_input("Project Directory (containing multiverse.toml)", key="mv_reconcile_dir")
+    prune = st.checkbox("Remove envs not listed in multiverse.toml", value=False, key="mv_prune")
+    col3, col4 = st.columns(2)
+    with col3:
+        if st.button("Plan", key="mv_plan") and project_dir:
+            try:
+                actions = reconcile_multiverse_project(Path(project_dir), dry_run=True)
+            except Exception as e:
+                st.error(f"Failed to read multiverse.toml: {e}")
+            else:
+                if actions:
+                    st.dataframe(pd.DataFrame(actions), use_container_width=True)
+                else:
+                    st.success("Project is up to date")
+    with col4:
+        if st.button("Reconcile", key="mv_reconcile") and project_dir:
+            try:
+                results = reconcile_multiverse_project(Path(project_dir), prune=prune)
+            except Exception as e:
+                st.error(f"Failed to reconcile project: {e}")
+            else:
+                if results:
+                    st.dataframe(pd.DataFrame(results), use_container_width=True)
+                if all(r["ok"] for r in results):
+                    st.success("Project reconciled")
+                else:
+                    st.error("Some changes could not be applied")
+
+    if st.button("Benchmark Startup", key="mv_benchmark") and project_dir:
+        try:
+            timings = benchmark_entry_point(Path(project_dir))
+        except Exception as e:
+            st.error(f"Benchmark failed: {e}")
+        else:
+            st.metric("Entry point startup", f"{timings['entry_point_ms']} ms",
+                      delta=f"{timings['overhead_ms']} ms over bare interpreter", delta_color="off")
+
 def main():
     """Main application entry point."""
     render_header()
@@ -0,0 +1,191 @@
+import sys
+import json
+import argparse
+import logging
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import pyenv_core as core
+from usage_index import get_version_users
+
+# Headless entry point: python -m pyenv_cli <command> ...
+# Every command prints JSON to stdout; logs go to stderr with --verbose.
+
+def cmd_check(args):
+    version = core.check_pyenv_installed()
+    return {"installed": version is not None, "version": version}, version is not None
+
+def cmd_versions(args):
+    return {
+        "installed": core.list_installed_versions(),
+        "global": core.list_global_version(),
+        "local": core.list_local_version()
+    }, True
+
+def cmd_available(args):
+    return core.get_available_versions(), True
+
+def _run_batch(op, versions, args):
+    from batch_ops import run_batch
+    results = run_batch(
+        [{"op": op, "version": v} for v in versions],
+        max_workers=args.jobs,
+        cwd=Path.cwd(),
+        dry_run=args.dry_run
+    )
+    return results, not any(r["status"] in ("failed", "invalid") for r in results)
+
+def cmd_install(args):
+    return _run_batch("install", args.versions, args)
+
+def cmd_uninstall(args):
+    if not args.force:
+        pinned = core.get_pinned_versions(args.versions, args.projects_dir)
+        if pinned:
+            return {"error": "Versions are still pinned; use --force to uninstall anyway", "pinned": pinned}, False
+    return _run_batch("uninstall", args.versions, args)
+
+def cmd_global(args):
+    return _run_batch("global", args.versions, args)
+
+def cmd_local(args):
+    return _run_batch("local", args.versions, args)
+
+def cmd_virtualenvs(args):
+    return core.get_virtualenvs(), True
+
+def cmd_create_env(args):
+    ok = core.create_virtualenv(args.version, args.name, not args.no_local)
+    return {"name": args.name, "created": ok}, ok
+
+def cmd_packages(args):
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        packages = dict(zip(args.envs, executor.map(core.manage_pip_packages, args.envs)))
+    return packages, True
+
+def cmd_usage(args):
+    _, usage = core.get_version_usage(args.projects_dir)
+    if args.versions:
+        usage = {v: get_version_users(v, usage) for v in args.versions}
+    return usage, True
+
+def cmd_orphans(args):
+    from usage_index import find_orphaned_versions
+    index, usage = core.get_version_usage(args.projects_dir)
+    return find_orphaned_versions(index, usage), True
+
+def cmd_advise(args):
+    from advisor import get_release_client, compute_advice, format_advice, newest_release
+    cycles = get_release_client().get(block=True)
+    if not cycles:
+        return {"error": get_release_client().last_error or "No release data"}, False
+    advice = compute_advice(core.list_installed_versions(), cycles)
+    return {
+        "advice": json.loads(advice.to_json(orient="records", date_format="iso")),
+        "suggestions": format_advice(advice, newest_release(cycles))
+    }, True
+
+def cmd_backup(args):
+    ok = core.backup_pyenv_config(args.path)
+    return {"backup": args.path, "ok": ok}, ok
+
+def cmd_restore(args):
+    ok = core.restore_pyenv_config(args.file)
+    return {"restored": args.file, "ok": ok}, ok
+
+def cmd_projects(args):
+    return core.get_recent_projects(), True
+
+def cmd_scaffold(args):
+    from scaffold import load_manifest, scaffold_projects
+    specs = load_manifest(Path(args.manifest))
+    results = scaffold_projects(specs, env_workers=args.env_workers)
+    for spec, result in zip(specs, results):
+        if not result["Error"]:
+            core.save_project_info(spec["path"], spec.get("type", ""), [spec.get("python_version", "")])
+    return results, not any(r["Error"] or r["Env"] == "failed" for r in results)
+
+def cmd_reconcile(args):
+    from multiverse import reconcile_multiverse_project
+    results = reconcile_multiverse_project(Path(args.project_dir), prune=args.prune, dry_run=args.dry_run)
+    return results, all(r.get("ok", True) for r in results)
+
+def cmd_health(args):
+    return core.get_environment_health(), True
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(prog="python -m pyenv_cli", description="Headless Pyenv Manager.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log commands to stderr")
+    parser.add_argument(
+        "--projects-dir", type=Path,
+        help="Directory of projects checked for pinned versions (default: $PYENV_MANAGER_PROJECTS_DIR)"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add(name, func, help_text):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.set_defaults(func=func)
+        return sub
+
+    add("check", cmd_check, "Show the pyenv version")
+    add("versions", cmd_versions, "List installed, global and local versions")
+    add("available", cmd_available, "List installable CPython 3.10+ versions")
+    for name, func, help_text in (
+        ("install", cmd_install, "Install one or more versions"),
+        ("uninstall", cmd_uninstall, "Uninstall one or more versions"),
+        ("global", cmd_global, "Set the global version(s)"),
+        ("local", cmd_local, "Set the local version(s)"),
+    ):
+        sub = add(name, func, help_text)
+        sub.add_argument("versions", nargs="+")
+        sub.add_argument("--jobs", type=int, default=4)
+        sub.add_argument("--dry-run", action="store_true")
+        if name == "uninstall":
+            sub.add_argument("--force", action="store_true", help="Uninstall even if projects pin it")
+    add("virtualenvs", cmd_virtualenvs, "List virtual environments")
+    sub = add("create-env", cmd_create_env, "Create a virtual environment")
+    sub.add_argument("version")
+    sub.add_argument("name")
+    sub.add_argument("--no-local", action="store_true", help="Do not pin it in the current directory")
+    sub = add("packages", cmd_packages, "List pip packages of one or more envs")
+    sub.add_argument("envs", nargs="+")
+    sub.add_argument("--jobs", type=int, default=4)
+    sub = add("usage", cmd_usage, "Show which project files pin each version")
+    sub.add_argument("versions", nargs="*")
+    add("orphans", cmd_orphans, "List versions and envs no project uses")
+    add("advise", cmd_advise, "Show upgrade and end-of-life advice")
+    sub = add("backup", cmd_backup, "Back up the pyenv root")
+    sub.add_argument("path")
+    sub = add("restore", cmd_restore, "Restore the pyenv root from a backup")
+    sub.add_argument("file")
+    add("projects", cmd_projects, "List recent projects")
+    sub = add("scaffold", cmd_scaffold, "Create projects from a manifest")
+    sub.add_argument("manifest")
+    sub.add_argument("--env-workers", type=int, default=4)
+    sub = add("reconcile", cmd_reconcile, "Reconcile a multiverse project with its multiverse.toml")
+    sub.add_argument("project_dir")
+    sub.add_argument("--prune", action="store_true")
+    sub.add_argument("--dry-run", action="store_true")
+    add("health", cmd_health, "Show system resource usage")
+    return parser
+
+def main(argv=None) -> int:
+    """Run one CLI command and print its result as JSON."""
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        stream=sys.stderr,
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(levelname)s: %(message)s"
+    )
+    try:
+        result, ok = args.func(args)
+    except Exception as e:
+        # Missing files, invalid manifests, ...: still answer in JSON
+        core.logger.debug("Command failed", exc_info=True)
+        result, ok = {"error": str(e)}, False
+    json.dump(result, sys.stdout, indent=2, default=str)
+    sys.stdout.write("\n")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
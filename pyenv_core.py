@@ -0,0 +1,340 @@
+import subprocess
+import os
+import re
+import json
+import shutil
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Optional
+from usage_index import get_pyenv_root, refresh_usage_index, build_usage_map, get_version_users
+
+# Core pyenv functions shared by the Streamlit app and the CLI. Heavy
+# dependencies (pandas, requests, psutil) are imported where they are used
+# so that headless callers start quickly.
+logger = logging.getLogger("pyenv_manager")
+
+def debug_log(message):
+    """Log debug messages."""
+    logger.debug(message)
+
+def run_command(command, check=True):
+    """Execute shell commands and handle errors."""
+    try:
+        result = subprocess.run(
+            command,
+            check=check,
+            shell=True,
+            capture_output=True,
+            text=True
+        )
+        debug_log(f"Command executed: {command}")
+        return result
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Command failed: {e}")
+        return None
+
+# Core Pyenv Functions
+def check_pyenv_installed():
+    """Check if pyenv is installed and accessible."""
+    result = run_command("pyenv --version", check=False)
+    if result and result.returncode == 0:
+        return result.stdout.strip()
+    return None
+
+def list_installed_versions():
+    """Get list of installed Python versions."""
+    result = run_command("pyenv versions --bare", check=False)
+    if result and result.returncode == 0:
+        return [v.strip() for v in result.stdout.split('\n') if v.strip() and v[0].isdigit()]
+    return []
+
+def install_version(version):
+    """Install a specific Python version."""
+    if version in list_installed_versions():
+        return True, "Version already installed"
+    
+    result = run_command(f"pyenv install {version}")
+    success = result and result.returncode == 0
+    message = "Installation successful" if success else "Installation failed"
+    return success, message
+
+def uninstall_version(version):
+    """Uninstall a specific Python version."""
+    result = run_command(f"pyenv uninstall -f {version}", check=False)
+    return result and result.returncode == 0
+
+def get_available_versions():
+    """Get list of available Python versions."""
+    result = run_command("pyenv install --list", check=False)
+    if result and result.returncode == 0:
+        versions = []
+        for line in result.stdout.splitlines():
+            version = line.strip()
+            if version and re.match(r'^3\.(1[0-3])\.\d+$', version):
+                versions.append(version)
+        return sorted(versions, reverse=True)
+    return []
+
+def set_python_version(version, scope='global'):
+    """Set Python version as global or local."""
+    cmd = f"pyenv {scope} {version}"
+    result = run_command(cmd)
+    return result and result.returncode == 0
+
+def update_pyenv():
+    """Update pyenv to the latest version."""
+    result = run_command("pyenv update")
+    return result and result.returncode == 0
+
+def list_global_version():
+    """Get the global Python version."""
+    result = run_command("pyenv global", check=False)
+    if result and result.returncode == 0:
+        return result.stdout.strip()
+    return None
+
+def list_local_version():
+    """Get the local Python version."""
+    result = run_command("pyenv local", check=False)
+    if result and result.returncode == 0:
+        return result.stdout.strip()
+    return None
+
+# Virtual Environment Functions
+def create_virtualenv(version, env_name, local=True):
+    """Create a new virtual environment."""
+    try:
+        # Install virtualenv if needed
+        run_command("pip install virtualenv")
+        
+        # Create the virtualenv
+        cmd = f"pyenv virtualenv {version} {env_name}"
+        result = run_command(cmd)
+        
+        if result and result.returncode == 0:
+            if local:
+                run_command(f"pyenv local {env_name}")
+            return True
+        return False
+    except Exception as e:
+        debug_log(f"Error creating virtualenv: {str(e)}")
+        return False
+
+def get_virtualenvs() -> List[Dict]:
+    """List all virtual environments."""
+    pyenv_root = get_pyenv_root()
+    venv_path = pyenv_root / "pyenv-win" / "versions" if os.name == 'nt' else pyenv_root / "versions"
+    venvs = []
+    
+    if venv_path.exists():
+        for entry in os.scandir(venv_path):
+            if entry.is_dir():
+                venvs.append({
+                    'Name': entry.name,
+                    'Path': entry.path,
+                    'Active': False
+                })
+    return venvs
+
+def backup_pyenv_config(backup_path):
+    """Backup pyenv configurations and environments."""
+    pyenv_root = get_pyenv_root()
+    if pyenv_root.exists():
+        shutil.make_archive(backup_path, 'zip', pyenv_root)
+        return True
+    return False
+
+def restore_pyenv_config(backup_file):
+    """Restore pyenv configurations from backup."""
+    pyenv_root = get_pyenv_root()
+    if isinstance(backup_file, (str, Path)):
+        if not os.path.exists(backup_file):
+            return False
+        shutil.unpack_archive(backup_file, pyenv_root)
+        return True
+    # Uploaded file objects are unpacked as zip archives
+    import zipfile
+    with zipfile.ZipFile(backup_file) as archive:
+        archive.extractall(pyenv_root)
+    return True
+
+def get_environment_health():
+    """Check Python environment health."""
+    import psutil
+    health_info = {
+        'disk_space': psutil.disk_usage('/').percent,
+        'memory_usage': psutil.virtual_memory().percent,
+        'cpu_usage': psutil.cpu_percent(),
+        'python_processes': len([p for p in psutil.process_iter(['name']) if 'python' in p.info['name'].lower()])
+    }
+    return health_info
+
+def manage_pip_packages(env_name):
+    """Manage pip packages for a specific environment."""
+    result = run_command(f'"$(pyenv prefix {env_name})/bin/python" -m pip list --format=json', check=False)
+    if result and result.returncode == 0:
+        return json.loads(result.stdout)
+    return []
+
+def get_default_project_path(project_name: str) -> Path:
+    """Get default project path on Desktop."""
+    desktop_path = Path.home() / "Desktop"
+    if not desktop_path.exists():
+        desktop_path = Path.home()  # Fallback to home directory
+    return desktop_path / project_name
+
+def create_project_structure(project_path: Path, python_version: str, packages=None, project_type=None):
+    """Create a new Python project structure."""
+    try:
+        # Create project directory and parents if they don't exist
+        project_path.mkdir(parents=True, exist_ok=True)
+        
+        # Create virtual environment
+        create_virtualenv(python_version, project_path.name, True)
+        
+        # Materialize the template's files alongside src/tests/docs
+        from scaffold import render_project_files, write_project_files
+        structure = generate_project_template(project_type).get('structure', [])
+        _, skipped = write_project_files(project_path, render_project_files(project_path.name, packages, structure))
+        if skipped:
+            debug_log(f"Kept {skipped} existing file(s) in {project_path}")
+        
+        return True
+    except Exception as e:
+        debug_log(f"Error creating project structure: {str(e)}")
+        return False
+
+def analyze_dependencies(requirements):
+    """AI-powered dependency analysis and recommendations."""
+    import requests
+    try:
+        packages = [line.strip() for line in requirements.split('\n') if line.strip()]
+        recommendations = {
+            'security': [],
+            'performance': [],
+            'compatibility': []
+        }
+        
+        for package in packages:
+            # Check known conflicts and security issues
+            response = requests.get(f"https://pypi.org/pypi/{package}/json")
+            if response.status_code == 200:
+                data = response.json()
+                if 'security' in data.get('info', {}).get('keywords', []):
+                    recommendations['security'].append(f"⚠️ {package} has security notes")
+                # Add version compatibility checks
+                python_version = data.get('info', {}).get('requires_python', '')
+                if python_version:
+                    recommendations['compatibility'].append(f"ℹ️ {package} requires Python {python_version}")
+        
+        return recommendations
+    except Exception as e:
+        debug_log(f"Dependency analysis error: {str(e)}")
+        return None
+
+def generate_project_template(project_type):
+    """AI-powered project template generation."""
+    from scaffold import get_project_template
+    return get_project_template(project_type)
+
+def suggest_version_upgrade():
+    """AI-powered version upgrade suggestions."""
+    from advisor import get_release_client, compute_advice, newest_release, format_advice
+    # Never waits on the network: stale data is refreshed in the background
+    cycles = get_release_client().get()
+    if not cycles:
+        return []
+    advice = compute_advice(list_installed_versions(), cycles)
+    return format_advice(advice, newest_release(cycles))
+
+def get_release_data_loading():
+    """Whether release data for upgrade suggestions is still being fetched."""
+    from advisor import get_release_client
+    return get_release_client().is_refreshing()
+
+def get_recent_projects():
+    """Get list of recently created projects."""
+    projects_file = Path.home() / ".pyenv" / "projects.json"
+    if projects_file.exists():
+        with open(projects_file) as f:
+            return json.load(f)
+    return []
+
+def save_project_info(project_path: Path, project_type: str, python_versions: List[str]):
+    """Save project information for later access."""
+    projects_file = Path.home() / ".pyenv" / "projects.json"
+    # Re-creating a project moves it to the top instead of listing it twice
+    projects = [p for p in get_recent_projects() if p["path"] != str(project_path.absolute())]
+    project_info = {
+        "path": str(project_path.absolute()),
+        "type": project_type,
+        "python_versions": python_versions,
+        "created_at": datetime.now().isoformat()
+    }
+    projects.insert(0, project_info)
+    projects_file.parent.mkdir(exist_ok=True)
+    with open(projects_file, "w") as f:
+        json.dump(projects[:10], f)  # Keep only 10 most recent projects
+
+def get_projects_dir() -> Optional[Path]:
+    """Get the projects directory configured through PYENV_MANAGER_PROJECTS_DIR."""
+    projects_dir = os.environ.get("PYENV_MANAGER_PROJECTS_DIR")
+    return Path(projects_dir).expanduser() if projects_dir else None
+
+def get_usage_scan_roots(projects_dir: Optional[Path] = None) -> List[Path]:
+    """Get the directories scanned for projects pinning Python versions.
+
+    Only recent projects and an explicitly configured projects directory
+    are scanned, never the home or working directory.
+    """
+    roots = [Path(project["path"]) for project in get_recent_projects()]
+    projects_dir = projects_dir or get_projects_dir()
+    if projects_dir:
+        roots.append(Path(projects_dir).expanduser())
+    return roots
+
+def get_version_usage(projects_dir: Optional[Path] = None):
+    """Refresh the interpreter usage index and return it with the usage map."""
+    index = refresh_usage_index(get_usage_scan_roots(projects_dir))
+    return index, build_usage_map(index)
+
+def get_pinned_versions(versions: List[str], projects_dir: Optional[Path] = None) -> Dict[str, List[str]]:
+    """Map each of versions that a project still pins to the pin files using it."""
+    _, usage = get_version_usage(projects_dir)
+    pinned = {version: get_version_users(version, usage) for version in versions}
+    return {version: users for version, users in pinned.items() if users}
+
+def open_in_editor(path: str):
+    """Open project in VS Code."""
+    if os.path.exists(path):
+        subprocess.run(["code", path])
+        return True
+    return False
+
+def get_desktop_shortcut_content(project_path: Path) -> str:
+    """Generate desktop shortcut content."""
+    return f"""[Desktop Entry]
+Version=1.0
+Type=Application
+Name={project_path.name}
+Comment=Python Project created with Pyenv Manager
+Exec=code {project_path.absolute()}
+Icon=python
+Terminal=false
+Categories=Development;IDE;
+"""
+
+def create_desktop_shortcut(project_path: Path) -> bool:
+    """Create a desktop shortcut for the project."""
+    try:
+        desktop = Path.home() / "Desktop"
+        if desktop.exists():
+            shortcut_path = desktop / f"{project_path.name}.desktop"
+            with open(shortcut_path, "w") as f:
+                f.write(get_desktop_shortcut_content(project_path))
+            os.chmod(shortcut_path, 0o755)  # Make executable
+            return True
+    except Exception as e:
+        debug_log(f"Failed to create desktop shortcut: {e}")
+    return False
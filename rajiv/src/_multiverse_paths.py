@@ -0,0 +1,7 @@
+# Generated from multiverse.toml by Pyenv Manager; do not edit.
+VERSION_PATHS = {
+    "3.12.7": "envs/py3127",
+    "3.12": "envs/py3127",
+    "3.13.1": "envs/py3131",
+    "3.13": "envs/py3131",
+}
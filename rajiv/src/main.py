@@ -1,16 +1,47 @@
 
 import sys
 import os
-from pathlib import Path
+import importlib.machinery
+
+try:
+    from _multiverse_paths import VERSION_PATHS
+except ImportError:
+    VERSION_PATHS = {}
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 def get_python_version():
     return f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
 
+def get_version_path():
+    """Directory for this interpreter, falling back from major.minor.micro to major.minor."""
+    major_minor = f"{sys.version_info.major}.{sys.version_info.minor}"
+    rel_path = VERSION_PATHS.get(get_python_version()) or VERSION_PATHS.get(major_minor)
+    return os.path.join(PROJECT_ROOT, rel_path) if rel_path else None
+
+class VersionSpecificFinder:
+    """Resolve only the top-level modules shipped in the version directory."""
+
+    def __init__(self, path):
+        self.path = [path]
+        self.names = set()
+        for entry in os.scandir(path):
+            name = entry.name.split(".", 1)[0]
+            if entry.is_dir() and name.isidentifier():
+                self.names.add(name)
+            elif entry.name.endswith(tuple(importlib.machinery.all_suffixes())):
+                self.names.add(name)
+
+    def find_spec(self, fullname, path=None, target=None):
+        # Submodules resolve through their package's __path__
+        if path is not None or fullname not in self.names:
+            return None
+        return importlib.machinery.PathFinder.find_spec(fullname, self.path)
+
 def load_version_specific_modules():
-    version = get_python_version()
-    version_path = Path(__file__).parent.parent / "envs" / f"py{version.replace('.', '')}"
-    if version_path.exists():
-        sys.path.insert(0, str(version_path))
+    version_path = get_version_path()
+    if version_path and os.path.isdir(version_path):
+        sys.meta_path.insert(0, VersionSpecificFinder(version_path))
 
 def main():
     print(f"Running with Python {get_python_version()}")
@@ -0,0 +1,312 @@
+import sys
+import json
+import time
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional, Tuple
+import toml
+import yaml
+from usage_index import get_versions_dir, list_interpreters, resolve_interpreter
+
+# Scaffolding engine for materializing project templates in batches
+MAX_IO_WORKERS = 16
+MAX_ENV_WORKERS = 4
+
+PROJECT_TEMPLATES = {
+    'web': {
+        'packages': ['flask', 'gunicorn', 'python-dotenv'],
+        'structure': [
+            'src/__init__.py',
+            'src/routes.py',
+            'src/models.py',
+            'templates/base.html',
+            'static/style.css',
+            '.env.example'
+        ]
+    },
+    'data-science': {
+        'packages': ['numpy', 'pandas', 'scikit-learn', 'jupyter'],
+        'structure': [
+            'notebooks/',
+            'data/raw/',
+            'data/processed/',
+            'src/data_processing.py',
+            'src/modeling.py'
+        ]
+    },
+    'cli': {
+        'packages': ['click', 'rich', 'typer'],
+        'structure': [
+            'src/cli.py',
+            'src/commands/',
+            'src/utils.py'
+        ]
+    }
+}
+
+TEMPLATE_CONTENT = {
+    'src/routes.py': '''from flask import Flask, render_template
+
+app = Flask(__name__, template_folder="../templates", static_folder="../static")
+
+@app.route("/")
+def index():
+    return render_template("base.html")
+''',
+    'src/models.py': '"""Data models."""\n',
+    'templates/base.html': '''<!DOCTYPE html>
+<html>
+<head>
+  <title>{name}</title>
+  <link rel="stylesheet" href="/static/style.css">
+</head>
+<body>
+  {{% block content %}}<h1>{name}</h1>{{% endblock %}}
+</body>
+</html>
+''',
+    'static/style.css': 'body {{ font-family: sans-serif; }}\n',
+    '.env.example': 'FLASK_ENV=development\nSECRET_KEY=change-me\n',
+    'src/data_processing.py': '''import pandas as pd
+
+def load_raw(path):
+    """Load a raw dataset from data/raw."""
+    return pd.read_csv(path)
+''',
+    'src/modeling.py': '"""Model training and evaluation."""\n',
+    'src/cli.py': '''import click
+
+@click.group()
+def cli():
+    """{name} command line interface."""
+
+if __name__ == "__main__":
+    cli()
+''',
+    'src/utils.py': '"""Shared helpers."""\n',
+}
+
+GITIGNORE = '''
+__pycache__/
+*.py[cod]
+*$py.class
+*.so
+.Python
+build/
+develop-eggs/
+dist/
+downloads/
+eggs/
+.eggs/
+lib/
+lib64/
+parts/
+sdist/
+var/
+wheels/
+*.egg-info/
+.installed.cfg
+*.egg
+.env
+venv/
+.venv/
+'''
+
+def get_project_template(project_type: str) -> Dict:
+    """Get the package list and file structure for a project type."""
+    return PROJECT_TEMPLATES.get(project_type, {})
+
+def render_project_files(project_name: str, packages: Optional[List[str]] = None,
+                         structure: Optional[List[str]] = None) -> Dict[str, Optional[str]]:
+    """Render a project's files as relative path -> content (None for directories)."""
+    files = {'src/': None, 'tests/': None, 'docs/': None}
+    for entry in structure or []:
+        if entry.endswith('/'):
+            files[entry] = None
+        elif entry in TEMPLATE_CONTENT:
+            files[entry] = TEMPLATE_CONTENT[entry].format(name=project_name)
+        else:
+            files[entry] = ''
+    # Make package directories under src/ importable
+    for entry in structure or []:
+        if entry.startswith('src/') and entry.endswith('/'):
+            files[entry + '__init__.py'] = ''
+    if packages:
+        files['requirements.txt'] = '\n'.join(packages)
+    files['.gitignore'] = GITIGNORE
+    files['README.md'] = f'# {project_name}\n\nProject created with Pyenv Manager'
+    return files
+
+def _write_file(path: Path, content: str) -> float:
+    """Write one scaffolded file and return the seconds spent writing it."""
+    start = time.perf_counter()
+    with open(path, 'w') as f:
+        f.write(content)
+    return time.perf_counter() - start
+
+def _timed(func, *args):
+    """Run func in the worker and return (result, seconds spent in it)."""
+    start = time.perf_counter()
+    return func(*args), time.perf_counter() - start
+
+def write_project_files(project_path: Path, files: Dict[str, Optional[str]],
+                        executor: Optional[ThreadPoolExecutor] = None) -> Tuple[List, int]:
+    """Create a project's directories and write the files it is missing.
+
+    Existing files are left alone so re-running a manifest never overwrites
+    a user's edits. Directories are made up front; file writes go to the
+    executor when one is given. Returns the pending futures and the number
+    of files skipped because they already existed.
+    """
+    dirs = {project_path}
+    for rel_path, content in files.items():
+        target = project_path / rel_path
+        dirs.add(target if content is None else target.parent)
+    for directory in sorted(dirs):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    writes = [(project_path / p, c) for p, c in files.items() if c is not None]
+    missing = [(path, content) for path, content in writes if not path.exists()]
+    skipped = len(writes) - len(missing)
+    if executor is None:
+        for path, content in missing:
+            _write_file(path, content)
+        return [], skipped
+    return [executor.submit(_write_file, path, content) for path, content in missing], skipped
+
+def create_project_env(python_version: str, env_name: str, project_path: Path) -> str:
+    """Create a pyenv virtualenv for a project and pin it locally.
+
+    An existing env with the same name is reused only if it runs on the
+    requested interpreter; otherwise ValueError is raised.
+    """
+    versions_dir = get_versions_dir()
+    if (versions_dir / env_name).exists():
+        installed = list_interpreters(versions_dir)
+        base = resolve_interpreter(env_name, versions_dir, installed)
+        if base != resolve_interpreter(python_version, versions_dir, installed):
+            raise ValueError(f"Env {env_name} already exists on Python {base}, not {python_version}")
+    if not (versions_dir / env_name).exists():
+        result = subprocess.run(
+            ["pyenv", "virtualenv", python_version, env_name],
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            return "failed"
+        status = "created"
+    else:
+        status = "exists"
+    # Same file `pyenv local` writes, without spawning another process
+    with open(project_path / ".python-version", "w") as f:
+        f.write(f"{env_name}\n")
+    return status
+
+def parse_manifest(text: str, fmt: str = "toml") -> List[Dict]:
+    """Parse a batch manifest into fully resolved project specs.
+
+    The manifest has an optional ``defaults`` table (python_version, type,
+    base_dir, create_env, packages) and a ``projects`` list whose entries
+    need at least a ``name``.
+    """
+    if fmt == "toml":
+        manifest = toml.loads(text)
+    elif fmt in ("yaml", "yml"):
+        manifest = yaml.safe_load(text) or {}
+    elif fmt == "json":
+        manifest = json.loads(text)
+    else:
+        raise ValueError(f"Unsupported manifest format: {fmt}")
+
+    defaults = manifest.get("defaults", {})
+    specs, names = [], set()
+    for project in manifest.get("projects", []):
+        spec = {**defaults, **project}
+        if not spec.get("name"):
+            raise ValueError("Every manifest project needs a name")
+        # Project names double as env names, so they must be unique
+        if spec["name"] in names:
+            raise ValueError(f"Duplicate project name in manifest: {spec['name']}")
+        names.add(spec["name"])
+        template = get_project_template(spec.get("type", ""))
+        spec.setdefault("packages", template.get("packages", []))
+        spec["structure"] = template.get("structure", [])
+        base_dir = Path(spec.get("base_dir", ".")).expanduser()
+        spec["path"] = Path(spec.get("path", base_dir / spec["name"])).expanduser()
+        spec.setdefault("create_env", bool(spec.get("python_version")))
+        specs.append(spec)
+    return specs
+
+def load_manifest(manifest_file: Path) -> List[Dict]:
+    """Load a batch manifest from a .toml, .yaml/.yml or .json file."""
+    manifest_file = Path(manifest_file)
+    return parse_manifest(manifest_file.read_text(), manifest_file.suffix.lstrip(".").lower())
+
+def scaffold_projects(specs: List[Dict], io_workers: int = MAX_IO_WORKERS,
+                      env_workers: int = MAX_ENV_WORKERS) -> List[Dict]:
+    """Scaffold many projects at once and report per-project timings.
+
+    File writes for all projects share one thread pool, while env creation
+    runs through a separate pool bounded by ``env_workers`` so a batch never
+    launches more than that many ``pyenv virtualenv`` processes. Timings are
+    measured inside the workers, so they exclude time spent queued.
+    """
+    results = []
+    pending = {}
+    with ThreadPoolExecutor(max_workers=io_workers) as io_pool, \
+            ThreadPoolExecutor(max_workers=max(1, env_workers)) as env_pool:
+        for i, spec in enumerate(specs):
+            results.append({
+                "Name": spec["name"],
+                "Path": str(spec["path"]),
+                "Files": 0,
+                "Skipped": 0,
+                "Env": "skipped",
+                "Files (s)": 0.0,
+                "Env (s)": None,
+                "Total (s)": None,
+                "Error": None
+            })
+            try:
+                files = render_project_files(spec["name"], spec.get("packages"), spec["structure"])
+                (writes, skipped), mkdir_seconds = _timed(write_project_files, spec["path"], files, io_pool)
+            except Exception as e:
+                results[i]["Error"] = str(e)
+                continue
+            results[i]["Files"] = len(writes)
+            results[i]["Skipped"] = skipped
+            results[i]["Files (s)"] += mkdir_seconds
+            for future in writes:
+                pending[future] = (i, "Files")
+            if spec.get("create_env") and spec.get("python_version"):
+                future = env_pool.submit(
+                    _timed, create_project_env, spec["python_version"], spec["name"], spec["path"]
+                )
+                pending[future] = (i, "Env")
+
+        for future in as_completed(pending):
+            i, kind = pending[future]
+            try:
+                if kind == "Env":
+                    results[i]["Env"], results[i]["Env (s)"] = future.result()
+                else:
+                    results[i]["Files (s)"] += future.result()
+            except Exception as e:
+                results[i]["Error"] = str(e)
+                if kind == "Env":
+                    results[i]["Env"] = "failed"
+
+    for result in results:
+        result["Total (s)"] = round(result["Files (s)"] + (result["Env (s)"] or 0), 3)
+        result["Files (s)"] = round(result["Files (s)"], 3)
+        if result["Env (s)"] is not None:
+            result["Env (s)"] = round(result["Env (s)"], 3)
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(f"Usage: {sys.argv[0]} MANIFEST", file=sys.stderr)
+        sys.exit(2)
+    for result in scaffold_projects(load_manifest(Path(sys.argv[1]))):
+        print(json.dumps(result))
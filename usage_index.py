@@ -0,0 +1,238 @@
+import os
+import json
+import time
+from pathlib import Path
+from typing import List, Dict, Iterable, Optional
+import toml
+
+# Pyenv Manager's own state lives outside PYENV_ROOT so pyenv never sees it
+APP_DIR = Path(os.environ.get("PYENV_MANAGER_HOME", "~/.pyenv-manager")).expanduser()
+
+# Reverse index from pyenv interpreters/envs to the files that pin them
+INDEX_FILE = APP_DIR / "usage_index.json"
+INDEX_FORMAT = 1
+PIN_FILES = (".python-version", "multiverse.toml")
+SKIP_DIRS = {"__pycache__", "node_modules", "site-packages", "venv", "build", "dist"}
+MAX_DEPTH = 4
+# Installs into site-packages don't touch the top-level mtime, so sizes expire
+SIZE_TTL = 3600
+
+def get_pyenv_root() -> Path:
+    """Get the pyenv root directory, honouring PYENV_ROOT."""
+    return Path(os.environ.get("PYENV_ROOT", "~/.pyenv")).expanduser()
+
+def get_versions_dir() -> Path:
+    """Get the directory holding installed interpreters and env aliases."""
+    return get_pyenv_root() / "versions"
+
+def load_usage_index(index_file: Path = INDEX_FILE) -> Dict:
+    """Load the persisted usage index, or an empty one."""
+    try:
+        with open(index_file) as f:
+            index = json.load(f)
+        if index.get("format") == INDEX_FORMAT:
+            return index
+    except (OSError, ValueError):
+        pass
+    return {"format": INDEX_FORMAT, "dirs": {}, "pins": {}, "sizes": {}}
+
+def save_usage_index(index: Dict, index_file: Path = INDEX_FILE):
+    """Persist the usage index atomically."""
+    index_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = index_file.with_suffix(".tmp")
+    with open(tmp_file, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp_file, index_file)
+
+def parse_pin_file(path: Path) -> List[str]:
+    """Return the interpreter/env names pinned by a pin file."""
+    try:
+        if path.name == "multiverse.toml":
+            config = toml.load(path)
+            project = config.get("project", {})
+            versions = [str(v) for v in project.get("python_versions", [])]
+            # setup_environments names its envs "<project>-<version>"
+            name = project.get("name")
+            envs = [f"{name}-{v}" for v in versions] if name else []
+            return versions + envs
+        with open(path) as f:
+            lines = [line.split("#", 1)[0] for line in f]
+        return [token for line in lines for token in line.split()]
+    except Exception:
+        return []
+
+def _scan_dir(path: str):
+    """List the subdirectories and pin files of one directory."""
+    subdirs, pins = [], []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                if entry.name in PIN_FILES and entry.is_file():
+                    pins.append(entry.name)
+                elif (entry.is_dir(follow_symlinks=False)
+                      and not entry.name.startswith(".")
+                      and entry.name not in SKIP_DIRS):
+                    subdirs.append(entry.name)
+            except OSError:
+                continue
+    return subdirs, pins
+
+def _refresh_pin(index: Dict, path: str, seen: Dict):
+    """Re-parse a pin file only if it changed since the last refresh."""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return
+    cached = index["pins"].get(path)
+    if cached and cached["mtime"] == mtime:
+        seen[path] = cached
+    else:
+        seen[path] = {"mtime": mtime, "versions": parse_pin_file(Path(path))}
+
+def refresh_usage_index(roots: Iterable[Path], index: Optional[Dict] = None,
+                        index_file: Path = INDEX_FILE, max_depth: int = MAX_DEPTH) -> Dict:
+    """Bring the usage index up to date with the pin files under roots.
+
+    Directories whose mtime is unchanged reuse their cached listing, and pin
+    files are only re-parsed when their own mtime changes, so a refresh of
+    an unchanged tree costs one stat per directory and pin file.
+    """
+    if index is None:
+        index = load_usage_index(index_file)
+    dirs, pins = {}, {}
+
+    stack = [(os.path.abspath(os.path.expanduser(str(root))), 0) for root in roots]
+    while stack:
+        path, depth = stack.pop()
+        if path in dirs:
+            continue
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+        cached = index["dirs"].get(path)
+        if cached and cached["mtime"] == mtime:
+            entry = cached
+        else:
+            try:
+                subdirs, pin_names = _scan_dir(path)
+            except OSError:
+                continue
+            entry = {"mtime": mtime, "subdirs": subdirs, "pins": pin_names}
+        dirs[path] = entry
+
+        for name in entry["pins"]:
+            _refresh_pin(index, os.path.join(path, name), pins)
+        if depth < max_depth:
+            stack.extend((os.path.join(path, name), depth + 1) for name in entry["subdirs"])
+
+    # The global version file pins an interpreter for every project
+    _refresh_pin(index, str(get_pyenv_root() / "version"), pins)
+
+    if dirs != index["dirs"] or pins != index["pins"]:
+        index["dirs"], index["pins"] = dirs, pins
+        save_usage_index(index, index_file)
+    return index
+
+def version_key(name: str):
+    """Sort key for version strings like 3.12.1."""
+    return tuple(int(part) if part.isdigit() else -1 for part in name.split("."))
+
+def resolve_interpreter(name: str, versions_dir: Path, installed: List[str]) -> str:
+    """Resolve a pinned name to the interpreter it runs on."""
+    if "/envs/" in name:
+        return name.split("/envs/", 1)[0]
+    alias = versions_dir / name
+    if alias.is_symlink():
+        target = alias.resolve()
+        if target.parent.name == "envs":
+            return target.parent.parent.name
+    if name in installed:
+        return name
+    # pyenv resolves prefixes like "3.12" to the newest matching install
+    matches = [v for v in installed if v.startswith(name + ".")]
+    return max(matches, key=version_key) if matches else name
+
+def list_interpreters(versions_dir: Path) -> List[str]:
+    """List installed interpreters, excluding env alias symlinks."""
+    if not versions_dir.is_dir():
+        return []
+    return sorted(
+        (e.name for e in os.scandir(versions_dir) if e.is_dir(follow_symlinks=False)),
+        key=version_key
+    )
+
+def _env_name(name: str) -> str:
+    """Bare env name for ``X/envs/NAME``; other names are returned unchanged."""
+    return name.split("/envs/", 1)[1] if "/envs/" in name else name
+
+def build_usage_map(index: Dict, versions_dir: Optional[Path] = None) -> Dict[str, List[str]]:
+    """Map each pinned name and its interpreter to the pin files using it.
+
+    Envs are keyed by their bare name, whether pinned as ``NAME`` or
+    ``X/envs/NAME``.
+    """
+    versions_dir = versions_dir or get_versions_dir()
+    installed = list_interpreters(versions_dir)
+    usage = {}
+    for pin_path, pin in index["pins"].items():
+        for name in pin["versions"]:
+            for key in {_env_name(name), resolve_interpreter(name, versions_dir, installed)}:
+                usage.setdefault(key, set()).add(pin_path)
+    return {name: sorted(paths) for name, paths in usage.items()}
+
+def get_version_users(version: str, usage: Dict[str, List[str]]) -> List[str]:
+    """Get the pin files that still depend on an interpreter or env.
+
+    An env can be given as ``NAME`` or as ``X/envs/NAME``, the form
+    ``pyenv versions`` lists it in.
+    """
+    return usage.get(_env_name(version), [])
+
+def _dir_size(path: str) -> int:
+    """Total size in bytes of a directory tree, without following symlinks."""
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                pass
+    return total
+
+def _cached_size(index: Dict, path: str) -> int:
+    """Directory size, recomputed when the directory mtime changes or after SIZE_TTL."""
+    mtime = os.stat(path).st_mtime_ns
+    cached = index["sizes"].get(path)
+    if cached and cached["mtime"] == mtime and time.time() - cached.get("computed_at", 0) < SIZE_TTL:
+        return cached["bytes"]
+    size = _dir_size(path)
+    index["sizes"][path] = {"mtime": mtime, "bytes": size, "computed_at": time.time()}
+    return size
+
+def find_orphaned_versions(index: Dict, usage: Dict[str, List[str]],
+                           versions_dir: Optional[Path] = None,
+                           index_file: Path = INDEX_FILE) -> List[Dict]:
+    """List interpreters and envs no pin file depends on, with their size."""
+    versions_dir = versions_dir or get_versions_dir()
+    orphans = []
+    for version in list_interpreters(versions_dir):
+        version_dir = versions_dir / version
+        if version not in usage:
+            orphans.append({"Name": version, "Kind": "interpreter", "Path": str(version_dir)})
+            continue
+        envs_dir = version_dir / "envs"
+        if envs_dir.is_dir():
+            for entry in os.scandir(envs_dir):
+                if entry.is_dir(follow_symlinks=False) and entry.name not in usage:
+                    orphans.append({"Name": entry.name, "Kind": "env", "Path": entry.path})
+
+    sizes_before = dict(index["sizes"])
+    for orphan in orphans:
+        try:
+            orphan["Size (MB)"] = round(_cached_size(index, orphan["Path"]) / 2**20, 1)
+        except OSError:
+            orphan["Size (MB)"] = None
+    if index["sizes"] != sizes_before:
+        save_usage_index(index, index_file)
+    return orphans